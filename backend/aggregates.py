@@ -0,0 +1,191 @@
+"""Match-set aggregates for summaries: one vectorized pass over rows, or precomputed per group"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from catalog import Catalog, STATUS_VALUES
+from index import InvertedIndex
+from models import ExtractedFilters, MatchStats, READING_FIELDS
+
+# Categorical columns counted for every match set
+DIMENSIONS = ('city', 'bhk', 'status_display', 'locality', 'amenities')
+
+# Columns the precomputed groups are keyed on, and the filter each one answers
+GROUP_DIMENSIONS = ('city', 'bhk', 'status_display')
+GROUP_FILTERS = {'city', 'bhk', 'possession_status'}
+
+# Counted per group as (group, code) -> rows, since they have too many values to key groups on
+DETAIL_DIMENSIONS = ('locality', 'amenities')
+
+TOP_LOCALITIES = 3
+TOP_AMENITIES = 3
+
+
+def aggregate_rows(catalog: Catalog, row_ids: np.ndarray) -> MatchStats:
+    """Aggregate any set of rows with one bincount per column"""
+    counts = {}
+    for name in DIMENSIONS:
+        codes = catalog.column(name, row_ids).cat.codes.to_numpy()
+        counts[name] = np.bincount(codes[codes >= 0], minlength=len(catalog.categories(name)))
+
+    prices = catalog.column('price_raw', row_ids).to_numpy(dtype=float)
+    prices = prices[prices > 0]
+    return _to_stats(
+        catalog, counts, len(row_ids),
+        float(prices.sum()), len(prices),
+        float(prices.min()) if len(prices) else None,
+        float(prices.max()) if len(prices) else None,
+    )
+
+
+def _to_stats(catalog: Catalog, counts: Dict[str, np.ndarray], total: int, price_sum: float, price_count: int,
+              price_min: Optional[float], price_max: Optional[float]) -> MatchStats:
+    """MatchStats from per-category counts; categories are sorted, so code order breaks ties by name"""
+    def ranked(name: str) -> list:
+        present = np.flatnonzero(counts[name])
+        order = np.lexsort((present, -counts[name][present]))
+        return catalog.categories(name)[present[order]].tolist()
+
+    statuses = pd.Series(counts['status_display'], index=catalog.categories('status_display').str.lower())
+
+    amenity_counts = {}
+    for combination, count in zip(catalog.categories('amenities'), counts['amenities']):
+        if count:
+            for amenity in filter(None, combination.split('|')):
+                amenity_counts[amenity] = amenity_counts.get(amenity, 0) + int(count)
+    amenities = sorted(amenity_counts, key=lambda amenity: (-amenity_counts[amenity], amenity))
+
+    return MatchStats(
+        total=total,
+        cities=ranked('city'),
+        localities=ranked('locality')[:TOP_LOCALITIES],
+        bhk_types=ranked('bhk'),
+        avg_price=price_sum / price_count if price_count else 0,
+        price_min=price_min,
+        price_max=price_max,
+        ready_count=int(statuses[statuses.index.str.contains('ready')].sum()),
+        under_construction_count=int(statuses[statuses.index.str.contains('construction')].sum()),
+        amenities=amenities[:TOP_AMENITIES],
+    )
+
+
+class GroupStats:
+    """
+    Count and price aggregates per (city, BHK, status) group, precomputed over the catalog
+
+    Queries filtered only by city, BHK and/or status match whole groups, so
+    their summary is a sum over the selected groups, O(groups) instead of
+    O(matches). Locality and amenity counts are kept per group as sparse
+    (code, count) lists in CSR layout.
+    """
+
+    def __init__(self, catalog: Catalog, arrays: Dict[str, np.ndarray]):
+        self.catalog = catalog
+        self.arrays = arrays
+
+    @classmethod
+    def build(cls, catalog: Catalog, address_index: InvertedIndex) -> "GroupStats":
+        codes = {name: catalog.column(name).cat.codes.to_numpy() for name in DIMENSIONS}
+        shape = tuple(len(catalog.categories(name)) for name in GROUP_DIMENSIONS)
+        groups, inverse = np.unique(
+            np.ravel_multi_index([codes[name] for name in GROUP_DIMENSIONS], shape), return_inverse=True
+        )
+
+        prices = catalog.column('price_raw').to_numpy(dtype=float)
+        priced = prices > 0
+        price_min = np.full(len(groups), np.inf)
+        price_max = np.full(len(groups), -np.inf)
+        np.minimum.at(price_min, inverse[priced], prices[priced])
+        np.maximum.at(price_max, inverse[priced], prices[priced])
+
+        arrays = dict(zip(GROUP_DIMENSIONS, (dim.astype(np.int32) for dim in np.unravel_index(groups, shape))))
+        arrays.update(
+            count=np.bincount(inverse, minlength=len(groups)),
+            price_sum=np.bincount(inverse, weights=np.where(priced, prices, 0), minlength=len(groups)),
+            price_count=np.bincount(inverse, weights=priced, minlength=len(groups)).astype(np.int64),
+            price_min=price_min,
+            price_max=price_max,
+        )
+
+        for name in DETAIL_DIMENSIONS:
+            width = len(catalog.categories(name))
+            pairs, pair_counts = np.unique(inverse.astype(np.int64) * width + codes[name], return_counts=True)
+            arrays[f"{name}.codes"] = (pairs % width).astype(np.int32)
+            arrays[f"{name}.counts"] = pair_counts
+            arrays[f"{name}.offsets"] = np.searchsorted(pairs // width, np.arange(len(groups) + 1))
+
+        # The city filter is a token match on fullAddress; groups answer it only
+        # where that selects exactly the rows whose derived city is the same name
+        exact = [
+            code for code, city in enumerate(catalog.categories('city'))
+            if np.array_equal(address_index.match(city), np.flatnonzero(codes['city'] == code))
+        ]
+        arrays['exact_cities'] = np.array(exact, dtype=np.int32)
+        return cls(catalog, arrays)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, object], prefix: str, catalog: Catalog) -> "GroupStats":
+        start = len(prefix) + 1
+        return cls(catalog, {name[start:]: value for name, value in arrays.items() if name.startswith(f"{prefix}.")})
+
+    def to_arrays(self, prefix: str) -> Dict[str, object]:
+        return {f"{prefix}.{name}": value for name, value in self.arrays.items()}
+
+    def select(self, filters: ExtractedFilters) -> Optional[np.ndarray]:
+        """
+        Ids of the groups whose union is exactly the filters' match set
+
+        Returns:
+            Group ids, or None if the filters cut across groups
+        """
+        used = {name for name, value in filters if value is not None}
+        if used - GROUP_FILTERS - READING_FIELDS:
+            return None
+
+        arrays = self.arrays
+        selected = np.ones(len(arrays['count']), dtype=bool)
+        if filters.city:
+            cities = self.catalog.categories('city')
+            codes = []
+            for city in filters.accepted('city'):
+                if city not in cities:
+                    return None
+                code = cities.get_loc(city)
+                if code not in arrays['exact_cities']:
+                    return None
+                codes.append(code)
+            selected &= np.isin(arrays['city'], codes)
+        if filters.bhk:
+            # Same case-insensitive comparison the type index makes
+            labels = self.catalog.categories('bhk').str.strip().str.lower()
+            accepted = [bhk.strip().lower() for bhk in filters.accepted('bhk')]
+            selected &= np.isin(arrays['bhk'], np.flatnonzero(labels.isin(accepted)))
+        statuses = filters.accepted('possession_status')
+        if statuses and all(status in STATUS_VALUES for status in statuses):
+            selected &= self.catalog.categories('status_display')[arrays['status_display']].isin(statuses)
+        return np.flatnonzero(selected)
+
+    def stats(self, groups: np.ndarray) -> MatchStats:
+        """Aggregate the selected groups"""
+        arrays = self.arrays
+        weights = arrays['count'][groups]
+        counts = {
+            name: np.bincount(arrays[name][groups], weights=weights,
+                              minlength=len(self.catalog.categories(name))).astype(np.int64)
+            for name in GROUP_DIMENSIONS
+        }
+        for name in DETAIL_DIMENSIONS:
+            offsets = arrays[f"{name}.offsets"]
+            entries = np.concatenate([np.arange(offsets[group], offsets[group + 1]) for group in groups]) \
+                if len(groups) else np.empty(0, dtype=np.int64)
+            counts[name] = np.bincount(arrays[f"{name}.codes"][entries], weights=arrays[f"{name}.counts"][entries],
+                                       minlength=len(self.catalog.categories(name))).astype(np.int64)
+
+        price_count = int(arrays['price_count'][groups].sum())
+        return _to_stats(
+            self.catalog, counts, int(weights.sum()),
+            float(arrays['price_sum'][groups].sum()), price_count,
+            float(arrays['price_min'][groups].min()) if price_count else None,
+            float(arrays['price_max'][groups].max()) if price_count else None,
+        )
@@ -1,19 +1,129 @@
 """
 FastAPI Main Application
 """
-from fastapi import FastAPI, HTTPException
+import asyncio
+import hmac
+import threading
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Callable, NamedTuple, Optional
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
-from models import ChatQuery, ChatResponse
-from query_parser import QueryParser
-from search_engine import SearchEngine
-from summarizer import Summarizer
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from models import ChatQuery, ChatResponse, ChatBatchQuery, ChatBatchResponse
+from executor import BoundedExecutor, ExecutorSaturated
+from pagination import InvalidCursor
+from results import dumps
+from metrics import REGISTRY, filter_label, record_stages, timed
+from log import get_logger
 from config import Config
 
+if TYPE_CHECKING:
+    from pipeline import ChatPipeline
+
+logger = get_logger('app')
+
+
+class Components(NamedTuple):
+    """Everything that needs the dataset loaded"""
+    pipeline: "ChatPipeline"
+    executor: BoundedExecutor
+    run_chat: Callable
+    run_chat_batch: Callable
+
+
+_components: Optional[Components] = None
+_components_lock = threading.Lock()
+_load_error: Optional[str] = None
+
+
+def components() -> Components:
+    """
+    Build the pipeline and executor on first use; later calls return the same ones
+    
+    The lifespan hook starts this in the background so the server is up
+    (and /health answers) while the dataset loads. Scripts that use the
+    app without running its lifespan pay the load on their first request.
+    """
+    global _components, _load_error
+    if _components is None:
+        with _components_lock:
+            if _components is None:
+                try:
+                    _components = _build_components()
+                    _load_error = None
+                except Exception as e:
+                    _load_error = str(e)
+                    raise
+    return _components
+
+
+def _build_components() -> Components:
+    # pandas, numpy and the dataset are only needed from here on
+    from pipeline import ChatPipeline, init_worker, run_in_worker, run_batch_in_worker
+    
+    logger.info("Initializing components...")
+    pipeline = ChatPipeline.from_config()
+    reloader = pipeline.reloader
+    result_cache = pipeline.cache
+    
+    # Parse + search + summarize run off the event loop; process workers load their own dataset
+    if Config.EXECUTOR_KIND == "process":
+        executor = BoundedExecutor("process", Config.EXECUTOR_WORKERS, Config.EXECUTOR_QUEUE, initializer=init_worker)
+        run_chat = run_in_worker
+        run_chat_batch = run_batch_in_worker
+        if Config.SESSION_STORE == "memory":
+            logger.warning("Sessions are kept per worker process; set SESSION_STORE to a shared store")
+        # Workers hold their own copy of the catalog, so restart them on every reload
+        reloader.on_reload(lambda engine: executor.restart())
+    else:
+        executor = BoundedExecutor("thread", Config.EXECUTOR_WORKERS, Config.EXECUTOR_QUEUE)
+        run_chat = pipeline.run
+        run_chat_batch = pipeline.run_batch
+    
+    # Scrape-time views of state owned by the executor, cache and reloader
+    REGISTRY.callback("chat_executor_in_flight", "Chat requests admitted and not finished", lambda: executor.pending)
+    REGISTRY.callback("chat_executor_queue_depth", "Chat requests waiting for a worker", lambda: executor.queue_depth)
+    REGISTRY.callback("chat_executor_rejected_total", "Chat requests rejected with 503", lambda: executor.rejected, "counter")
+    REGISTRY.callback("chat_executor_wait_seconds_max", "Longest queue wait so far", lambda: executor.wait_max)
+    REGISTRY.callback("chat_cache_hits_total", "Response cache hits", lambda: result_cache.hits, "counter")
+    REGISTRY.callback("chat_cache_misses_total", "Response cache misses", lambda: result_cache.misses, "counter")
+    REGISTRY.callback("chat_cache_entries", "Responses currently cached", lambda: len(result_cache))
+    if pipeline.sessions is not None:
+        sessions = pipeline.sessions
+        REGISTRY.callback("chat_sessions", "Conversation sessions currently kept", lambda: sessions.stats()["sessions"])
+    REGISTRY.callback("catalog_generation", "Catalog reloads applied since startup", lambda: reloader.generation)
+    logger.info("✓ All components initialized!")
+    return Components(pipeline, executor, run_chat, run_chat_batch)
+
+
+async def _loaded() -> Components:
+    """Components for a request, waiting for the dataset if it is still loading"""
+    if _components is not None:
+        return _components
+    return await asyncio.to_thread(components)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the dataset in the background; /ready reports when it is done"""
+    loading = asyncio.create_task(asyncio.to_thread(components))
+    loading.add_done_callback(_log_load_failure)
+    yield
+    if _components is not None:
+        _components.executor.shutdown()
+
+
+def _log_load_failure(loading: asyncio.Task):
+    if not loading.cancelled() and loading.exception() is not None:
+        logger.error("Loading the dataset failed: %s", loading.exception())
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Property Search Chatbot",
     version="1.1.0",
-    description="Chatbot To search Properties!"
+    description="Chatbot To search Properties!",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -25,13 +135,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize components (all LOCAL)
-print("Initializing components...")
-parser = QueryParser()
-search_engine = SearchEngine(data_path=Config.DATA_PATH)
-summarizer = Summarizer()
-print("✓ All components initialized!")
-
 
 @app.get("/")
 def root():
@@ -45,49 +148,188 @@ def root():
 
 
 @app.post("/api/chat", response_model=ChatResponse)
-def chat(query: ChatQuery):
+async def chat(query: ChatQuery):
     """
     Main chat endpoint - Processes queries
     
     Args:
-        query: ChatQuery with user message
+        query: ChatQuery with user message, page size and optional cursor
         
     Returns:
-        ChatResponse with summary and properties
+        ChatResponse with summary, one page of properties and the total match count
     """
     try:
-        print(f"\n{'='*60}")
-        print(f"Processing query: {query.message}")
-        
-        # 1. Parse query (LOCAL - regex based)
-        filters = parser.parse(query.message)
-        print(f"Extracted filters: {filters}")
-        
-        # 2. Search properties (LOCAL - pandas filtering)
-        properties = search_engine.search(filters)
-        print(f"Found {len(properties)} properties")
-        
-        # 3. Generate summary (LOCAL - rule based)
-        summary = summarizer.generate_summary(properties, filters)
-        print(f"Generated summary: {summary[:100]}...")
-        
-        print(f"{'='*60}\n")
+        parts = await _loaded()
+        response = await _submit(parts.executor, parts.run_chat, query.message, query.limit, query.cursor,
+                                 query.session_id)
+        return _json_response(response, filter_label(response.filters_applied))
+    
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorSaturated:
+        raise _busy()
+    except Exception as e:
+        logger.exception("Chat request failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/chat/batch", response_model=ChatBatchResponse)
+async def chat_batch(query: ChatBatchQuery):
+    """
+    Batch chat endpoint - answers many queries in one request
+    
+    Queries with identical parsed filters are searched once and share
+    index lookups, so this is much cheaper per query than /api/chat.
+    
+    Args:
+        query: ChatBatchQuery with the messages and page size
         
-        return ChatResponse(
-            summary=summary,
-            properties=properties,
-            filters_applied=filters,
-            total_results=len(properties)
-        )
+    Returns:
+        ChatBatchResponse with one first-page ChatResponse per message
+    """
+    try:
+        parts = await _loaded()
+        results = await _submit(parts.executor, parts.run_chat_batch, query.messages, query.limit)
+        return _json_response({"results": results}, 'batch')
     
+    except ExecutorSaturated:
+        raise _busy()
     except Exception as e:
-        print(f"Error: {str(e)}")
+        logger.exception("Chat request failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/chat/stream")
+async def chat_stream(query: ChatQuery, accept: Optional[str] = Header(None)):
+    """
+    Streaming chat endpoint - filters first, then each property card, then the summary
+    
+    Sends server-sent events when the client accepts text/event-stream,
+    NDJSON otherwise. Every event carries a name ('filters', 'property',
+    'summary' or 'error') and a JSON payload.
+    """
+    sse = "text/event-stream" in (accept or "")
+    parts = await _loaded()
+    try:
+        queue = _open_stream(parts, query)
+    except ExecutorSaturated:
+        raise _busy()
+    
+    # The first event settles the status code: parsed filters, or the error that prevented them
+    first = await queue.get()
+    if first[0] == "error":
+        error = first[1]
+        logger.error("Chat stream failed: %s", error)
+        raise HTTPException(status_code=400 if isinstance(error, InvalidCursor) else 500, detail=str(error))
+    
+    async def body():
+        timings = {}
+        item = first
+        while item is not None:
+            with timed(timings, "serialize"):
+                chunk = _encode_event(*item, sse=sse)
+            yield chunk
+            item = await queue.get()
+        record_stages(filter_label(first[1]), timings)
+    
+    return StreamingResponse(body(), media_type="text/event-stream" if sse else "application/x-ndjson")
+
+
+async def _submit(executor: BoundedExecutor, fn, *args):
+    """Run fn on the executor; process workers hand back their stage timings to record here"""
+    result = await executor.submit(fn, *args)
+    if Config.EXECUTOR_KIND == "process":
+        result, stages = result
+        for label, timings in stages:
+            record_stages(label, timings)
+    return result
+
+
+def _json_response(content, label: str) -> Response:
+    """
+    Encode results straight to JSON bytes, timing the serialize stage
+    
+    Returning a Response skips FastAPI's response_model validation; the
+    declared models only document the schema.
+    """
+    timings = {}
+    with timed(timings, "serialize"):
+        body = dumps(content)
+    record_stages(label, timings)
+    return Response(content=body, media_type="application/json")
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Server busy, please retry",
+        headers={"Retry-After": str(Config.RETRY_AFTER)}
+    )
+
+
+def _open_stream(parts: Components, query: ChatQuery) -> asyncio.Queue:
+    """Start producing chat events on the executor; the queue ends with None"""
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    
+    if Config.EXECUTOR_KIND == "process":
+        # Generators cannot cross processes: workers answer in full and the response is replayed
+        from pipeline import run_in_worker
+        future = parts.executor.submit(run_in_worker, query.message, query.limit, query.cursor, query.session_id)
+        future.add_done_callback(lambda done: _replay(done, queue))
+    else:
+        events = parts.pipeline.stream(query.message, query.limit, query.cursor, query.session_id)
+        parts.executor.submit(_produce, events, loop, queue)
+    return queue
+
+
+def _produce(events, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+    """Drain a pipeline event stream on a worker thread into the event loop's queue"""
+    try:
+        for event in events:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+    except Exception as e:
+        loop.call_soon_threadsafe(queue.put_nowait, ("error", e))
+    finally:
+        loop.call_soon_threadsafe(queue.put_nowait, None)
+
+
+def _replay(done: asyncio.Future, queue: asyncio.Queue):
+    if done.cancelled():
+        queue.put_nowait(("error", RuntimeError("Request cancelled")))
+    elif done.exception() is not None:
+        queue.put_nowait(("error", done.exception()))
+    else:
+        from pipeline import response_events
+        response, stages = done.result()
+        for label, timings in stages:
+            record_stages(label, timings)
+        for event in response_events(response):
+            queue.put_nowait(event)
+    queue.put_nowait(None)
+
+
+def _encode_event(event: str, payload, sse: bool) -> bytes:
+    """One event as an SSE frame or an NDJSON line"""
+    if event == "summary":
+        data = {
+            "summary": payload.summary,
+            "total_results": payload.total_results,
+            "next_cursor": payload.next_cursor
+        }
+    elif event == "error":
+        data = {"detail": str(payload)}
+    else:
+        data = payload
+    
+    if sse:
+        return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+    return dumps({"event": event, "data": data}) + b"\n"
+
+
 @app.get("/health")
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint - answers as soon as the server is up, before the dataset loads"""
     return {
         "status": "healthy",
         "mode": "local",
@@ -95,19 +337,57 @@ def health_check():
     }
 
 
+@app.get("/ready")
+def ready_check():
+    """Readiness endpoint - 200 once the dataset is loaded, 503 while loading or after a failed load"""
+    if _components is None:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "failed" if _load_error else "loading", "error": _load_error}
+        )
+    return {"status": "ready", "generation": _components.pipeline.reloader.generation}
+
+
 @app.get("/stats")
 def get_stats():
     """Get database statistics"""
     try:
-        stats = search_engine.get_stats()
+        parts = components()
+        stats = parts.pipeline.reloader.engine.get_stats()
         return {
             "status": "success",
-            "data": stats
+            "data": stats,
+            "cache": parts.pipeline.cache.stats(),
+            "executor": parts.executor.stats(),
+            "sessions": parts.pipeline.sessions.stats() if parts.pipeline.sessions is not None else None
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Per-stage latency histograms plus executor, cache and catalog gauges (Prometheus text format)"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/admin/reload", status_code=202)
+def reload_catalog(x_admin_token: Optional[str] = Header(None)):
+    """Rebuild the dataset from DATA_PATH in the background and swap it in (disabled without ADMIN_TOKEN)"""
+    if not Config.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), Config.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    
+    reloader = components().pipeline.reloader
+    started = reloader.reload()
+    return {
+        "status": "reloading" if started else "already reloading",
+        "generation": reloader.generation,
+        "last_error": reloader.last_error
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     print("\n" + "="*60)
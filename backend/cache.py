@@ -0,0 +1,91 @@
+"""In-process LRU cache with TTL for chat responses"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from models import ExtractedFilters
+
+
+def filters_key(filters: ExtractedFilters) -> tuple:
+    """
+    Canonical, hashable form of the filters: strings folded, floats normalized
+
+    Unset filters are left out, so adding filter fields does not change
+    the keys (and pagination cursors) of queries that do not use them.
+    Alternatives and exclusions are unordered, so they are sorted.
+    """
+    return tuple((name, _canonical(value)) for name, value in sorted(filters.model_dump(exclude_none=True).items()))
+
+
+def _canonical(value) -> Hashable:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, float):
+        return round(value, 2)
+    if isinstance(value, list):
+        return tuple(sorted(set(_canonical(item) for item in value)))
+    if isinstance(value, dict):
+        return tuple(sorted((name, _canonical(item)) for name, item in value.items()))
+    return value
+
+
+class ResultCache:
+    """Bounded LRU cache whose entries also expire after a fixed TTL"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, e.g. after the catalog was reloaded"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
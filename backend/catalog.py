@@ -0,0 +1,323 @@
+"""Columnar storage for the property catalog tables"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Columns read from each CSV; heavy text such as propertyImages,
+# aboutProperty and floorPlanImage is never loaded
+TABLES = {
+    'projects': ('project.csv', ['id', 'projectName', 'slug', 'status', 'possessionDate']),
+    'addresses': ('ProjectAddress.csv', ['projectId', 'landmark', 'fullAddress', 'pincode']),
+    'configs': ('ProjectConfiguration.csv', ['id', 'projectId', 'type']),
+    'variants': ('ProjectConfigurationVariant.csv',
+                 ['configurationId', 'bathrooms', 'balcony', 'lift', 'parkingType', 'furnishedType', 'carpetArea',
+                  'price', 'maintenanceCharges', 'updatedAt']),
+}
+
+# Possession status as parsed from queries -> value in project.csv
+STATUS_VALUES = {
+    'Ready To Move': 'READY_TO_MOVE',
+    'Under Construction': 'UNDER_CONSTRUCTION',
+}
+
+# Furnishing and parking as parsed from queries -> value in ProjectConfigurationVariant.csv
+FURNISHING_VALUES = {
+    'Furnished': 'FURNISHED',
+    'Semi Furnished': 'SEMI_FURNISHED',
+    'Unfurnished': 'UNFURNISHED',
+}
+PARKING_VALUES = {
+    'Covered': 'COVERED',
+    'Open': 'OPEN',
+}
+
+
+class Catalog:
+    """
+    Property catalog addressed by row id, one row per project/address/configuration/variant
+
+    In normalized mode the four tables are kept separate and a row is just a
+    tuple of integer surrogate keys; columns are gathered through those keys
+    on demand. Otherwise the tables are joined once into a single wide frame.
+    """
+
+    def __init__(self, data_path: str = "data/", normalized: bool = False):
+        self.data_path = data_path
+        self.normalized = normalized
+        self.tables = self._load_tables()
+        self.keys = self._join_keys()
+        self._owners = self._column_owners()
+
+        if not normalized:
+            merged = pd.DataFrame({column: self.column(column) for column in self._owners})
+            self.tables = {'rows': merged}
+            self.keys = {}
+            self._owners = self._column_owners()
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, object]) -> "Catalog":
+        """Rebuild a catalog from the flat arrays produced by to_arrays"""
+        catalog = cls.__new__(cls)
+        catalog.data_path = arrays['catalog.data_path']
+        catalog.normalized = arrays['catalog.normalized']
+        catalog.tables = {}
+        for name, columns in arrays['catalog.columns'].items():
+            table = {}
+            for column in columns:
+                prefix = f"tables.{name}.{column}"
+                if f"{prefix}.categories" in arrays:
+                    table[column] = pd.Categorical.from_codes(
+                        arrays[f"{prefix}.codes"], categories=arrays[f"{prefix}.categories"], validate=False
+                    )
+                else:
+                    table[column] = arrays[prefix]
+            catalog.tables[name] = pd.DataFrame(table, copy=False)
+        catalog.keys = {
+            name: arrays[f"keys.{name}"]
+            for name in arrays['catalog.keys']
+        }
+        catalog._owners = catalog._column_owners()
+        return catalog
+
+    def to_arrays(self) -> Dict[str, object]:
+        """Flatten tables and keys into named arrays; categoricals become codes plus categories"""
+        arrays = {
+            'catalog.data_path': self.data_path,
+            'catalog.normalized': self.normalized,
+            'catalog.columns': {name: list(table.columns) for name, table in self.tables.items()},
+            'catalog.keys': list(self.keys),
+        }
+        for name, table in self.tables.items():
+            for column in table.columns:
+                prefix = f"tables.{name}.{column}"
+                values = table[column]
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    arrays[f"{prefix}.codes"] = values.cat.codes.to_numpy()
+                    arrays[f"{prefix}.categories"] = values.cat.categories
+                else:
+                    arrays[prefix] = values.to_numpy()
+        for name, keys in self.keys.items():
+            arrays[f"keys.{name}"] = keys
+        return arrays
+
+    def __len__(self) -> int:
+        if self.normalized:
+            return len(self.keys['projects'])
+        return len(self.tables['rows'])
+
+    def column(self, name: str, row_ids: Optional[np.ndarray] = None) -> pd.Series:
+        """
+        Gather one column for the given rows
+
+        Args:
+            name: Column name from any table
+            row_ids: Positional row ids, or None for every row
+
+        Returns:
+            Series aligned with row_ids
+        """
+        owner = self._owners[name]
+        values = self.tables[owner][name]
+        if owner in self.keys:
+            keys = self.keys[owner]
+            positions = keys if row_ids is None else keys[row_ids]
+        else:
+            if row_ids is None:
+                return values
+            positions = row_ids
+        return values.take(positions).reset_index(drop=True)
+
+    def categories(self, name: str) -> pd.Index:
+        """Distinct values of a categorical column, in code order"""
+        return self.tables[self._owners[name]][name].cat.categories
+
+    def memory_usage(self) -> int:
+        """Approximate resident bytes held by tables and row keys"""
+        total = sum(int(table.memory_usage(deep=True).sum()) for table in self.tables.values())
+        total += sum(keys.nbytes for keys in self.keys.values())
+        return total
+
+    def _column_owners(self) -> Dict[str, str]:
+        owners = {}
+        for name, table in self.tables.items():
+            for column in table.columns:
+                # Join columns repeat across tables; the first (outermost) table owns the name
+                owners.setdefault(column, name)
+        return owners
+
+    def _load_tables(self) -> Dict[str, pd.DataFrame]:
+        """Load projected tables, coerce typed columns, derive display columns and encode strings as categoricals"""
+        tables = {}
+        for name, (filename, columns) in TABLES.items():
+            table = pd.read_csv(f"{self.data_path}{filename}", usecols=columns)
+
+            # Trailing all-missing row, addressed by key -1 when a left join finds no match
+            table = pd.concat([table, pd.DataFrame([{}], columns=table.columns)], ignore_index=True)
+            table = table.assign(**{
+                column: COLUMN_TYPES[column](table[column])
+                for column in table.columns if column in COLUMN_TYPES
+            })
+            table = DERIVED_COLUMNS[name](table)
+
+            for column in table.columns:
+                if pd.api.types.infer_dtype(table[column], skipna=True) == 'string':
+                    table[column] = table[column].astype('category')
+            tables[name] = table
+        return tables
+
+    def _join_keys(self) -> Dict[str, np.ndarray]:
+        """Left-join the tables on surrogate keys only: project -> address -> configuration -> variant"""
+        projects, addresses, configs, variants = (
+            self.tables[name].iloc[:-1] for name in ('projects', 'addresses', 'configs', 'variants')
+        )
+
+        # Integer surrogate keys are row positions within each table
+        project_keys = pd.DataFrame({'projects': np.arange(len(projects)), 'id': projects['id'].astype(object)})
+        address_keys = pd.DataFrame({'addresses': np.arange(len(addresses)), 'id': addresses['projectId'].astype(object)})
+        config_keys = pd.DataFrame({
+            'configs': np.arange(len(configs)),
+            'id': configs['projectId'].astype(object),
+            'config_id': configs['id'].astype(object),
+        })
+        variant_keys = pd.DataFrame({
+            'variants': np.arange(len(variants)),
+            'config_id': variants['configurationId'].astype(object),
+        })
+
+        rows = project_keys.merge(address_keys, on='id', how='left')
+        rows = rows.merge(config_keys, on='id', how='left')
+        rows = rows.merge(variant_keys, on='config_id', how='left')
+
+        return {
+            name: rows[name].fillna(-1).to_numpy(dtype=np.int32)
+            for name in ('projects', 'addresses', 'configs', 'variants')
+        }
+
+
+def _count(values: pd.Series) -> np.ndarray:
+    """Small non-negative counts as int8, -1 where missing, fractional or out of range"""
+    numbers = pd.to_numeric(values, errors='coerce')
+    valid = numbers.between(0, np.iinfo(np.int8).max) & (numbers == numbers.round())
+    return np.where(valid, numbers, -1).astype(np.int8)
+
+
+def _float32(values: pd.Series) -> np.ndarray:
+    """Measurements as float32, NaN where missing or unparseable"""
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float32)
+
+
+def _float64(values: pd.Series) -> np.ndarray:
+    """Rupee amounts as float64; float32 would round prices above 1.6 Cr"""
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _flag(values: pd.Series) -> np.ndarray:
+    """Booleans from true/false, yes/no or 1/0 in any case; missing or anything else is False"""
+    text = values.astype(str).str.strip().str.lower()
+    return text.isin(('true', 'yes', 'y', '1', '1.0')).to_numpy()
+
+
+def _enum(values: pd.Series) -> pd.Categorical:
+    """Upper-case enum values such as READY_TO_MOVE as a categorical, NaN where blank"""
+    text = values.astype(object).where(values.notna()).str.strip().str.upper()
+    return pd.Categorical(text.where(text != ''))
+
+
+def _pincode(values: pd.Series) -> pd.Categorical:
+    """Six-digit postal codes as a categorical of strings, NaN where missing or malformed"""
+    text = values.astype(object).where(values.notna()).astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+    return pd.Categorical(text.where(text.str.fullmatch(r'[1-9]\d{5}')))
+
+
+def _timestamps(values: pd.Series) -> np.ndarray:
+    """
+    Seconds since the epoch as float64, NaN where missing or unparseable
+
+    Values without an offset are read as UTC, so naive, 'Z' and '+05:30'
+    stamps can share a column.
+    """
+    parsed = pd.to_datetime(values, errors='coerce', format='ISO8601', utc=True)
+    return (parsed - pd.Timestamp(0, tz='UTC')).dt.total_seconds().to_numpy()
+
+
+def _derive_project_columns(table: pd.DataFrame) -> pd.DataFrame:
+    title = table['projectName'].fillna('Unnamed Project')
+    slug = table['slug'].fillna('')
+    return table.assign(
+        project_id=table['id'].fillna(''),
+        title=title,
+        slug=slug,
+        url='/project/' + slug,
+        status_display=table['status'].astype(object).fillna('').str.replace('_', ' ').str.title(),
+        possession_ts=_timestamps(table['possessionDate']),
+    )
+
+
+def _derive_address_columns(table: pd.DataFrame) -> pd.DataFrame:
+    address = table['fullAddress'].fillna('').str.lower()
+    city = np.select(
+        [address.str.contains('mumbai'), address.str.contains('pune'), address.str.contains('bangalore')],
+        ['Mumbai', 'Pune', 'Bangalore'],
+        default='India',
+    )
+    return table.assign(
+        city=city,
+        locality=table['landmark'].fillna('Location details available'),
+    )
+
+
+def _derive_config_columns(table: pd.DataFrame) -> pd.DataFrame:
+    return table.assign(bhk=table['type'].fillna('N/A'))
+
+
+def _derive_variant_columns(table: pd.DataFrame) -> pd.DataFrame:
+    # Format price
+    price = table['price']
+    price_display = np.where(
+        price >= 10000000,
+        (price / 10000000).map('₹{:.2f} Cr'.format),
+        (price / 100000).map('₹{:.2f} L'.format),
+    )
+    price_display = np.where(price.notna(), price_display, "Price on request")
+
+    # Extract amenities, stored '|'-joined so repeated combinations share one category
+    amenities = []
+    for lift, parking, balconies in zip(table['lift'], table['parkingType'].notna(), table['balcony']):
+        row_amenities = []
+        if lift:
+            row_amenities.append('Lift')
+        if parking:
+            row_amenities.append('Parking')
+        if balconies > 0:
+            row_amenities.append(f"{balconies} Balconies")
+        amenities.append('|'.join(row_amenities[:3]))  # Top 3 amenities
+
+    return table.assign(
+        price_display=price_display,
+        price_raw=price.fillna(0).astype(float),
+        amenities=amenities,
+        updated_ts=_timestamps(table['updatedAt']),
+    )
+
+
+DERIVED_COLUMNS = {
+    'projects': _derive_project_columns,
+    'addresses': _derive_address_columns,
+    'configs': _derive_config_columns,
+    'variants': _derive_variant_columns,
+}
+
+# Load-time representation of typed source columns; other string columns become categoricals
+COLUMN_TYPES = {
+    'bathrooms': _count,
+    'balcony': _count,
+    'carpetArea': _float32,
+    'price': _float64,
+    'maintenanceCharges': _float32,
+    'lift': _flag,
+    'parkingType': _enum,
+    'furnishedType': _enum,
+    'status': _enum,
+    'pincode': _pincode,
+}
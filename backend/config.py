@@ -10,3 +10,21 @@ class Config:
     DATA_PATH = os.getenv("DATA_PATH", "data/")
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8501").split(",")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", None)
+    NORMALIZED_STORAGE = os.getenv("NORMALIZED_STORAGE", "false").lower() == "true"
+    SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", ".snapshot/")
+    MMAP_DATASET = os.getenv("MMAP_DATASET", "false").lower() == "true"
+    RELOAD_INTERVAL = float(os.getenv("RELOAD_INTERVAL", 0))
+    ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", None)
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+    CACHE_TTL = float(os.getenv("CACHE_TTL", 300))
+    SESSION_STORE = os.getenv("SESSION_STORE", "memory")
+    SESSION_MAX = int(os.getenv("SESSION_MAX", 10000))
+    SESSION_TTL = float(os.getenv("SESSION_TTL", 1800))
+    SESSION_MAX_ROWS = int(os.getenv("SESSION_MAX_ROWS", 100000))
+    EXECUTOR_KIND = os.getenv("EXECUTOR_KIND", "thread")
+    EXECUTOR_WORKERS = int(os.getenv("EXECUTOR_WORKERS", 4))
+    EXECUTOR_QUEUE = int(os.getenv("EXECUTOR_QUEUE", 64))
+    RETRY_AFTER = int(os.getenv("RETRY_AFTER", 1))
+    RANK_WEIGHTS = os.getenv("RANK_WEIGHTS", "")
+    PLACES_PATH = os.getenv("PLACES_PATH", None)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -0,0 +1,120 @@
+"""Bounded executor for CPU-bound request work"""
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class ExecutorSaturated(Exception):
+    """Raised when every worker is busy and the queue is full"""
+
+
+def _timed_call(fn: Callable, enqueued_at: float, *args) -> tuple:
+    # Module-level so process pools can pickle it; wall clock works across processes
+    started_at = time.time()
+    return started_at - enqueued_at, fn(*args)
+
+
+class BoundedExecutor:
+    """
+    Thread or process pool with a bounded queue in front of it
+
+    At most `max_workers` calls run at once and at most `max_queue` more
+    wait for a worker; beyond that submit() fails fast with
+    ExecutorSaturated instead of letting latency grow without limit.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_queue: int = 64,
+                 initializer: Optional[Callable] = None):
+        """
+        Args:
+            kind: 'thread' or 'process'
+            max_workers: Pool size
+            max_queue: Calls allowed to wait for a free worker
+            initializer: Run once per worker (process pools preload the dataset here)
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.initializer = initializer
+        self._pool = self._new_pool()
+
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _new_pool(self) -> Executor:
+        if self.kind == "process":
+            # Imported here: it pulls in multiprocessing, which thread pools never need
+            from concurrent.futures import ProcessPoolExecutor
+            return ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer)
+        return ThreadPoolExecutor(max_workers=self.max_workers, initializer=self.initializer,
+                                  thread_name_prefix="chat")
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls accepted but still waiting for a free worker"""
+        return max(self.pending - self.max_workers, 0)
+
+    def submit(self, fn: Callable, *args) -> "asyncio.Future":
+        """
+        Schedule fn(*args) on the pool; await the returned future for its result
+
+        Admission is decided synchronously, so callers learn about
+        saturation before they commit to a response.
+
+        Raises:
+            ExecutorSaturated: If the pool and queue are both full
+        """
+        # Counters are only touched from the event loop thread
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ExecutorSaturated()
+
+        loop = asyncio.get_running_loop()
+        outcome = loop.create_future()
+        self.pending += 1
+        timed = loop.run_in_executor(self._pool, functools.partial(_timed_call, fn, time.time(), *args))
+        timed.add_done_callback(functools.partial(self._finished, outcome))
+        return outcome
+
+    def _finished(self, outcome: "asyncio.Future", timed: "asyncio.Future"):
+        self.pending -= 1
+        if outcome.cancelled():
+            return
+        if timed.cancelled():
+            outcome.cancel()
+        elif timed.exception() is not None:
+            outcome.set_exception(timed.exception())
+        else:
+            wait, result = timed.result()
+            self.completed += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            outcome.set_result(result)
+
+    def restart(self):
+        """Swap in a fresh pool (e.g. so process workers load new data); running calls finish on the old one"""
+        old, self._pool = self._pool, self._new_pool()
+        old.shutdown(wait=False)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.pending,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_avg_ms": round(self.wait_total / self.completed * 1000, 3) if self.completed else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
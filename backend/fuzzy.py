@@ -0,0 +1,87 @@
+"""Character-trigram index for typo-tolerant word lookups"""
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+GRAM = 3
+
+
+def trigrams(word: str) -> set:
+    """Distinct trigrams of a word padded at both ends, so its first and last letters count as much as the rest"""
+    padded = f"$${word}$$"
+    return {padded[start:start + GRAM] for start in range(len(padded) - GRAM + 1)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """Levenshtein distance between a and b, or None as soon as it must exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+def similarity(word: str, match: str, distance: int) -> float:
+    """Confidence in a correction: 1 minus the edits per character of the longer word"""
+    return 1 - distance / max(len(word), len(match))
+
+
+class TrigramIndex:
+    """
+    Vocabulary words posted under their trigrams
+
+    A word within k edits of the query shares all but at most 3k of the
+    query's distinct trigrams (one edit touches at most three of them), so
+    counting shared trigrams over the query's postings yields every
+    candidate, and only those few are checked with the bounded edit distance.
+    """
+
+    def __init__(self, counts: Dict[str, int]):
+        """
+        Args:
+            counts: Word -> how often the vocabulary uses it; ties between
+                equally close words go to the more frequent one
+        """
+        self.words: List[str] = sorted(counts)
+        self.weights: List[int] = [counts[word] for word in self.words]
+        self.positions: Dict[str, int] = {word: position for position, word in enumerate(self.words)}
+        self.postings: Dict[str, List[int]] = {}
+        for position, word in enumerate(self.words):
+            for gram in trigrams(word):
+                self.postings.setdefault(gram, []).append(position)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.positions
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def lookup(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        """
+        Vocabulary words within max_distance edits of word
+
+        Returns:
+            (word, distance) pairs, closest and then most frequent first
+        """
+        grams = trigrams(word)
+        needed = len(grams) - GRAM * max_distance
+        if needed > 0:
+            shared = Counter()
+            for gram in grams:
+                shared.update(self.postings.get(gram, ()))
+            candidates = [position for position, count in shared.items() if count >= needed]
+        else:
+            # Too short for the count filter to prune anything
+            candidates = range(len(self.words))
+
+        matches = []
+        for position in candidates:
+            distance = edit_distance(word, self.words[position], max_distance)
+            if distance is not None:
+                matches.append((distance, -self.weights[position], self.words[position]))
+        return [(match, distance) for distance, _, match in sorted(matches)]
@@ -0,0 +1,147 @@
+"""Locality and project-name gazetteer built from the catalog"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from fuzzy import TrigramIndex
+from index import tokenize
+
+# Words that never make a locality or project mention on their own
+GENERIC_TERMS = {
+    'a', 'an', 'and', 'at', 'by', 'for', 'in', 'near', 'of', 'on', 'opp', 'opposite', 'the', 'to',
+    'road', 'rd', 'east', 'west', 'north', 'south', 'no', 'sr', 'plot', 'building', 'wing', 'phase',
+    'flat', 'flats', 'apartment', 'apartments', 'project', 'projects', 'property', 'properties',
+    'india', 'maharashtra', 'mumbai', 'bombay', 'pune', 'bangalore', 'bengaluru', 'delhi',
+    'address', 'landmark',
+}
+
+MAX_PHRASE_TOKENS = 5
+
+LOCALITY = 'locality'
+PROJECT = 'project'
+
+# Slugs look like [luxury-]<name>-<sublocality>-<locality>-<city>-<id>
+SLUG_TAIL = 4
+
+
+class Gazetteer:
+    """
+    Word-level trie over catalog phrases, resolving mentions to canonical entities
+
+    Every entity is a (kind, key) pair, where kind is 'locality' or
+    'project' and key is the phrase's tokens joined without spaces, so
+    'Model Colony' and the slug form 'modelcolony' are one entity. It
+    carries a display name and the ids of the projects it refers to.
+    The words of every phrase are also indexed by trigram, so misspelled
+    mentions can be corrected before they are looked up.
+    """
+
+    def __init__(self):
+        self.trie: Dict = {}
+        self.names: Dict[Tuple[str, str], str] = {}
+        self.projects: Dict[Tuple[str, str], Set[str]] = {}
+        self.word_counts: Counter = Counter()
+        self.words = TrigramIndex({})
+
+    @classmethod
+    def from_projects(cls, rows: Iterable[Tuple[str, str, str, str, str]]) -> "Gazetteer":
+        """
+        Build from (project_id, projectName, slug, landmark, fullAddress) tuples
+
+        Localities come from landmarks, short comma-separated address parts
+        and the locality segments of slugs; project names from projectName
+        and the name part of slugs.
+        """
+        gazetteer = cls()
+        for project_id, name, slug, landmark, address in rows:
+            project_key = gazetteer.add(PROJECT, name, project_id)
+
+            slug_parts = [part for part in (slug or '').split('-') if part]
+            if len(slug_parts) > SLUG_TAIL:
+                head = slug_parts[:-SLUG_TAIL]
+                if head[0] == 'luxury':
+                    head = head[1:]
+                gazetteer.add(PROJECT, ' '.join(head), project_id, canonical=project_key)
+                for part in slug_parts[-SLUG_TAIL:-2]:
+                    gazetteer.add(LOCALITY, part, project_id)
+
+            gazetteer.add(LOCALITY, landmark, project_id)
+            for part in (address or '').split(','):
+                # Short, number-free address parts are usually locality names
+                if not re.search(r'\d', part) and len(tokenize(part)) <= 3:
+                    gazetteer.add(LOCALITY, part, project_id)
+        gazetteer.words = TrigramIndex(gazetteer.word_counts)
+        return gazetteer
+
+    def add(self, kind: str, phrase: Optional[str], project_id: str,
+            canonical: Optional[str] = None) -> Optional[str]:
+        """
+        Register a phrase for an entity
+
+        Args:
+            kind: 'locality' or 'project'
+            phrase: Text as it appears in the catalog
+            project_id: Project the phrase refers to
+            canonical: Key of an existing entity this phrase is an alias of
+
+        Returns:
+            The entity key, or None if the phrase is too generic to index
+        """
+        if not isinstance(phrase, str):
+            return None
+        tokens = tokenize(phrase)
+        if not tokens or len(tokens) > MAX_PHRASE_TOKENS:
+            return None
+        if all(token in GENERIC_TERMS or token.isdigit() or len(token) < 3 for token in tokens):
+            return None
+
+        key = canonical or ''.join(tokens)
+        display = ' '.join(phrase.split())
+        current = self.names.get((kind, key))
+        if current is None or (current.islower() and not display.islower()):
+            # Prefer catalog casing ('Chembur') over slug casing ('chembur')
+            self.names[(kind, key)] = display
+        self.projects.setdefault((kind, key), set()).add(project_id)
+        self.word_counts.update(token for token in tokens if token not in GENERIC_TERMS and token.isalpha())
+
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        entities = node.setdefault(None, [])
+        if (kind, key) not in entities:
+            entities.append((kind, key))
+        return key
+
+    def find(self, text: str) -> List[List[Tuple[str, str]]]:
+        """
+        Longest non-overlapping mentions in text, left to right
+
+        Returns:
+            One list of (kind, key) entities per mention
+        """
+        tokens = tokenize(text)
+        found = []
+        start = 0
+        while start < len(tokens):
+            node = self.trie
+            end, entities = start, None
+            for position in range(start, min(len(tokens), start + MAX_PHRASE_TOKENS)):
+                node = node.get(tokens[position])
+                if node is None:
+                    break
+                if None in node:
+                    end, entities = position + 1, node[None]
+            if entities:
+                found.append(entities)
+                start = end
+            else:
+                start += 1
+        return found
+
+    def name(self, kind: str, key: str) -> str:
+        """Display name of an entity"""
+        return self.names[(kind, key)]
+
+    def project_ids(self, kind: str, name: str) -> Optional[Set[str]]:
+        """Projects an entity refers to, looked up by key or display name"""
+        return self.projects.get((kind, ''.join(tokenize(name))))
@@ -0,0 +1,160 @@
+"""Offline locality/pincode centroids and radius search over them"""
+import math
+import os
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fuzzy import TrigramIndex
+from index import tokenize
+from models import MAX_RADIUS_KM
+
+# Bundled table of pincode, locality, city, latitude, longitude; centroids are
+# approximate (about a kilometre), which is the resolution addresses are placed at
+PLACES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'places.csv')
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Grid cell edge in degrees, about 5.5 km of latitude
+CELL_DEGREES = 0.05
+
+# Radius of a bare 'near X'
+DEFAULT_RADIUS_KM = 3.0
+
+# Longest run of words tried as a place name ('Baner Road Pune' still names Baner)
+MAX_PLACE_TOKENS = 4
+
+
+def search_radius(radius_km: Optional[float]) -> float:
+    """Radius of a 'near' search: the one asked for (0 is the place's own pincode), else the default"""
+    return DEFAULT_RADIUS_KM if radius_km is None else radius_km
+
+
+def haversine_km(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from one point to each of many, all in degrees"""
+    latitude, longitude = math.radians(latitude), math.radians(longitude)
+    latitudes, longitudes = np.radians(latitudes), np.radians(longitudes)
+    a = (np.sin((latitudes - latitude) / 2) ** 2
+         + math.cos(latitude) * np.cos(latitudes) * np.sin((longitudes - longitude) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _cell(degrees) -> np.ndarray:
+    """Grid row (latitude) or column (longitude) of a coordinate"""
+    return np.floor_divide(degrees, CELL_DEGREES).astype(int)
+
+
+class Places:
+    """
+    Named points and pincode centroids, with a uniform grid over the pincodes
+
+    Catalog rows are placed by the pincode of their address, so a radius
+    query answers with pincodes: the grid limits the candidates to the cells
+    overlapping the circle's bounding box, and only those are checked by
+    great-circle distance. A pincode's centroid is the mean of its localities.
+    """
+
+    def __init__(self, table: pd.DataFrame):
+        table = table.dropna(subset=['pincode', 'latitude', 'longitude'])
+        centroids = table.groupby('pincode', sort=True)[['latitude', 'longitude']].mean()
+        self.pincodes: List[str] = list(centroids.index)
+        self.latitudes = centroids['latitude'].to_numpy()
+        self.longitudes = centroids['longitude'].to_numpy()
+
+        # Locality name (tokens joined, like gazetteer keys) or pincode -> (display name, pincode, latitude, longitude)
+        self.points: Dict[str, Tuple[str, str, float, float]] = {
+            pincode: (pincode, pincode, float(latitude), float(longitude))
+            for pincode, latitude, longitude in zip(self.pincodes, self.latitudes, self.longitudes)
+        }
+        named = zip(table['locality'], table['pincode'], table['latitude'], table['longitude'])
+        for name, pincode, latitude, longitude in named:
+            self.points.setdefault(''.join(tokenize(name)), (name, pincode, float(latitude), float(longitude)))
+        # Words of the locality names, for correcting misspelled places
+        self.words = TrigramIndex(Counter(
+            token for name in table['locality'] for token in tokenize(name) if token.isalpha()
+        ))
+
+        # (row, column) -> positions of the pincodes whose centroid falls in the cell
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        for position, cell in enumerate(zip(_cell(self.latitudes).tolist(), _cell(self.longitudes).tolist())):
+            self.cells.setdefault(cell, []).append(position)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "Places":
+        """Read a places table, by default the bundled one"""
+        return cls(pd.read_csv(path or PLACES_PATH, dtype={'pincode': str}))
+
+    def resolve(self, text: str) -> Optional[str]:
+        """
+        Display name of the place the text starts with
+
+        The longest leading run of words that names a locality or pincode
+        wins, so 'baner road, pune' resolves to 'Baner'.
+        """
+        tokens = tokenize(text)
+        for end in range(min(len(tokens), MAX_PLACE_TOKENS), 0, -1):
+            point = self.points.get(''.join(tokens[:end]))
+            if point is not None:
+                return point[0]
+        return None
+
+    def locate(self, name: str) -> Optional[Tuple[float, float]]:
+        """(latitude, longitude) of a locality name or pincode, or None when unknown"""
+        point = self.points.get(''.join(tokenize(name)))
+        return None if point is None else point[2:]
+
+    def around(self, name: str, radius_km: float) -> Optional[List[str]]:
+        """
+        Pincodes within radius_km of a locality or pincode, or None when it is unknown
+
+        The place's own pincode comes first and is always included, even
+        when a small radius does not reach the pincode's centroid.
+        """
+        point = self.points.get(''.join(tokenize(name)))
+        if point is None:
+            return None
+        _, pincode, latitude, longitude = point
+        return [pincode] + [nearby for nearby in self.pincodes_within(latitude, longitude, radius_km) if nearby != pincode]
+
+    def pincodes_within(self, latitude: float, longitude: float, radius_km: float) -> List[str]:
+        """
+        Pincodes whose centroid lies within radius_km of the point, nearest first
+
+        Args:
+            latitude: Latitude of the centre, in degrees
+            longitude: Longitude of the centre, in degrees
+            radius_km: Search radius
+
+        Returns:
+            Pincodes ordered by distance
+        """
+        # Wider circles reach nothing more, and would overflow the grid cell arithmetic
+        radius_km = min(radius_km, MAX_RADIUS_KM)
+        latitude_span = radius_km / KM_PER_DEGREE
+        longitude_span = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6))
+        rows = range(_cell(latitude - latitude_span), _cell(latitude + latitude_span) + 1)
+        columns = range(_cell(longitude - longitude_span), _cell(longitude + longitude_span) + 1)
+
+        # A circle wider than the table visits more cells than there are pincodes
+        if len(rows) * len(columns) > len(self.pincodes):
+            candidates = np.arange(len(self.pincodes))
+        else:
+            candidates = np.array(
+                [position for row in rows for column in columns for position in self.cells.get((row, column), ())],
+                dtype=int,
+            )
+
+        distances = haversine_km(latitude, longitude, self.latitudes[candidates], self.longitudes[candidates])
+        inside = distances <= radius_km
+        nearest = candidates[inside][np.argsort(distances[inside], kind='stable')]
+        return [self.pincodes[position] for position in nearest]
+
+
+@lru_cache(maxsize=None)
+def load_places(path: Optional[str] = None) -> Places:
+    """Places table shared by every engine built from the same file"""
+    return Places.load(path)
@@ -0,0 +1,389 @@
+"""Inverted and range indexes over catalog row ids"""
+import operator
+import re
+from functools import reduce
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Bitmaps split row ids into chunks of 2**16; a chunk with more rows than
+# ARRAY_LIMIT is smaller as a 1024-word bitset than as a uint16 array
+CHUNK_BITS = 16
+ARRAY_LIMIT = 4096
+
+
+def tokenize(text) -> List[str]:
+    """Split text into lowercase alphanumeric tokens"""
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def intersect(postings: Iterable[np.ndarray]) -> Optional[np.ndarray]:
+    """
+    Intersect sorted row-id arrays, smallest first
+
+    Returns:
+        Sorted row ids present in every array, or None if nothing was given
+    """
+    postings = sorted(postings, key=len)
+    if not postings:
+        return None
+
+    result = postings[0]
+    for other in postings[1:]:
+        if len(result) == 0:
+            break
+        result = np.intersect1d(result, other, assume_unique=True)
+    return result
+
+
+class Bitmap:
+    """
+    Compressed set of row ids in the style of roaring bitmaps
+
+    Each chunk of 2**16 row ids holds its low bits either as a sorted
+    uint16 array (sparse) or a uint64 bitset (dense), so a stored set
+    costs at most about two bytes per row. &, | and - work chunk by chunk
+    on bitwise words or small arrays, never sorting the full sets;
+    their bitset results are not re-compacted, since they are short-lived.
+    """
+
+    def __init__(self, chunks: Optional[Dict[int, np.ndarray]] = None, rows: Optional[np.ndarray] = None):
+        # High bits -> container; bitsets are the uint64 containers
+        self._chunks = chunks
+        # Sorted row ids, kept from from_rows or decoded once by to_rows
+        self._rows = rows
+        self._size = None
+
+    @classmethod
+    def from_rows(cls, rows: np.ndarray) -> "Bitmap":
+        """Wrap sorted, unique row ids; chunks are built on the first set operation"""
+        return cls(rows=np.asarray(rows))
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "Bitmap":
+        """Build from a boolean mask over row ids"""
+        return cls(_mask_chunks(mask))
+
+    @classmethod
+    def full(cls, size: int) -> "Bitmap":
+        """Every row id below size"""
+        return cls.from_mask(np.ones(size, dtype=bool))
+
+    @property
+    def chunks(self) -> Dict[int, np.ndarray]:
+        if self._chunks is None:
+            rows = self._rows
+            if len(rows) and len(rows) * 8 > rows[-1]:
+                # Dense sets pack faster through one mask than chunk by chunk
+                mask = np.zeros(int(rows[-1]) + 1, dtype=bool)
+                mask[rows] = True
+                self._chunks = _mask_chunks(mask)
+            else:
+                high = rows >> CHUNK_BITS
+                starts = np.flatnonzero(np.diff(high, prepend=-1))
+                stops = np.append(starts[1:], len(rows))
+                chunks = {}
+                for start, stop in zip(starts, stops):
+                    low = (rows[start:stop] & 0xFFFF).astype(np.uint16)
+                    chunks[int(high[start])] = _bitset(low) if len(low) > ARRAY_LIMIT else low
+                self._chunks = chunks
+        return self._chunks
+
+    def to_rows(self) -> np.ndarray:
+        """Sorted row ids as int32"""
+        if self._rows is None:
+            parts = [
+                (_decode(container) if container.dtype == np.uint64 else container).astype(np.int32)
+                + (high << CHUNK_BITS)
+                for high, container in sorted(self.chunks.items())
+            ]
+            self._rows = np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+        return self._rows
+
+    def __len__(self) -> int:
+        if self._rows is not None:
+            return len(self._rows)
+        if self._size is None:
+            self._size = sum(
+                np.count_nonzero(_bits(container)) if container.dtype == np.uint64 else len(container)
+                for container in self.chunks.values()
+            )
+        return self._size
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        chunks = {}
+        for high in self.chunks.keys() & other.chunks.keys():
+            a, b = self.chunks[high], other.chunks[high]
+            if a.dtype == np.uint64 and b.dtype == np.uint64:
+                container = a & b
+            elif a.dtype == np.uint64:
+                container = b[_contains(a, b)]
+            elif b.dtype == np.uint64:
+                container = a[_contains(b, a)]
+            else:
+                container = np.intersect1d(a, b, assume_unique=True)
+            if not _empty(container):
+                chunks[high] = container
+        return Bitmap(chunks)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        chunks = dict(self.chunks)
+        for high, b in other.chunks.items():
+            a = chunks.get(high)
+            if a is None:
+                chunks[high] = b
+            elif a.dtype == np.uint64 or b.dtype == np.uint64:
+                chunks[high] = _as_bitset(a) | _as_bitset(b)
+            else:
+                union = np.union1d(a, b)
+                chunks[high] = _bitset(union) if len(union) > ARRAY_LIMIT else union
+        return Bitmap(chunks)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        chunks = {}
+        for high, a in self.chunks.items():
+            b = other.chunks.get(high)
+            if b is None:
+                container = a
+            elif a.dtype == np.uint64:
+                container = a & ~_as_bitset(b)
+            elif b.dtype == np.uint64:
+                container = a[~_contains(b, a)]
+            else:
+                container = np.setdiff1d(a, b, assume_unique=True)
+            if not _empty(container):
+                chunks[high] = container
+        return Bitmap(chunks)
+
+
+def _mask_chunks(mask: np.ndarray) -> Dict[int, np.ndarray]:
+    chunk_size = 1 << CHUNK_BITS
+    chunks = {}
+    for high in range(-(-len(mask) // chunk_size)):
+        bits = mask[high * chunk_size:(high + 1) * chunk_size]
+        size = np.count_nonzero(bits)
+        if size > ARRAY_LIMIT:
+            words = np.packbits(bits, bitorder="little")
+            chunks[high] = np.pad(words, (0, chunk_size // 8 - len(words))).view(np.uint64)
+        elif size:
+            chunks[high] = np.flatnonzero(bits).astype(np.uint16)
+    return chunks
+
+
+def _empty(container: np.ndarray) -> bool:
+    # An array container holding only low bits 0 is not empty, so only bitsets are tested by value
+    return not container.any() if container.dtype == np.uint64 else not len(container)
+
+
+def _bitset(low: np.ndarray) -> np.ndarray:
+    bits = np.zeros(1 << CHUNK_BITS, dtype=bool)
+    bits[low] = True
+    return np.packbits(bits, bitorder="little").view(np.uint64)
+
+
+def _as_bitset(container: np.ndarray) -> np.ndarray:
+    return container if container.dtype == np.uint64 else _bitset(container)
+
+
+def _bits(words: np.ndarray) -> np.ndarray:
+    # As bool, which np.flatnonzero scans about twice as fast as uint8
+    return np.unpackbits(words.view(np.uint8), bitorder="little").view(bool)
+
+
+def _decode(bitset: np.ndarray) -> np.ndarray:
+    """Set bit positions of a bitset, unpacking only its non-zero words"""
+    words = np.flatnonzero(bitset)
+    if len(words) * 4 > len(bitset) * 3:
+        return np.flatnonzero(_bits(bitset))
+    positions = np.flatnonzero(_bits(bitset[words]))
+    return words[positions >> 6] * 64 + (positions & 63)
+
+
+def _contains(bitset: np.ndarray, low: np.ndarray) -> np.ndarray:
+    """Mask of the low bits in `low` that are set in `bitset`"""
+    words = bitset[low >> 6]
+    return ((words >> (low & 63).astype(np.uint64)) & np.uint64(1)).astype(bool)
+
+
+class InvertedIndex:
+    """Map each key to the sorted array of row ids holding it (CSR layout)"""
+
+    def __init__(self, keys: List[str], offsets: np.ndarray, postings: np.ndarray):
+        self.keys = keys
+        self.offsets = offsets
+        self.postings = postings
+        self._slots = {key: slot for slot, key in enumerate(keys)}
+        self._bitmaps: Dict[int, Bitmap] = {}
+
+    @classmethod
+    def from_values(cls, values, tokenized: bool = False) -> "InvertedIndex":
+        """
+        Build from one value per row; missing values are not indexed
+
+        Args:
+            values: Row values, ideally categorical so each distinct value is visited once
+            tokenized: Post each row under every token of its text instead of the whole value
+        """
+        values = pd.Categorical(values)
+        codes = values.codes
+
+        # Expand distinct values into (key, category) pairs
+        keys: Dict[str, int] = {}
+        pair_keys = []
+        pair_categories = []
+        for category_code, category in enumerate(values.categories):
+            terms = set(tokenize(category)) if tokenized else {str(category).strip().lower()}
+            for term in terms:
+                pair_keys.append(keys.setdefault(term, len(keys)))
+                pair_categories.append(category_code)
+
+        # Group rows by category, then emit every row once per key of its category
+        order = np.argsort(codes, kind="stable").astype(np.int32)
+        bounds = np.searchsorted(codes[order], np.arange(len(values.categories) + 1))
+        counts = np.diff(bounds)
+        pair_categories = np.asarray(pair_categories, dtype=np.int64)
+        rows = [order[bounds[code]:bounds[code + 1]] for code in pair_categories]
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+        key_codes = np.repeat(np.asarray(pair_keys, dtype=np.int32), counts[pair_categories])
+
+        return cls._from_pairs(list(keys), key_codes, rows)
+
+    @classmethod
+    def merge(cls, previous: "InvertedIndex", remap: np.ndarray,
+              fresh: "InvertedIndex", fresh_rows: np.ndarray) -> "InvertedIndex":
+        """
+        Combine carried-over postings with postings for re-indexed rows
+
+        Args:
+            previous: Index over the old row ids
+            remap: New row id for every old row id, -1 where the row was dropped
+            fresh: Index built over only the re-indexed rows
+            fresh_rows: New row id of each row `fresh` was built from
+        """
+        keys = {key: slot for slot, key in enumerate(previous.keys)}
+        fresh_slots = np.asarray([keys.setdefault(key, len(keys)) for key in fresh.keys], dtype=np.int32)
+
+        old_codes = np.repeat(np.arange(len(previous.keys), dtype=np.int32), np.diff(previous.offsets))
+        old_rows = remap[previous.postings]
+        kept = old_rows >= 0
+
+        fresh_codes = np.repeat(fresh_slots, np.diff(fresh.offsets))
+        key_codes = np.concatenate([old_codes[kept], fresh_codes])
+        rows = np.concatenate([old_rows[kept], fresh_rows[fresh.postings]]).astype(np.int32)
+        return cls._from_pairs(list(keys), key_codes, rows)
+
+    @classmethod
+    def _from_pairs(cls, keys: List[str], key_codes: np.ndarray, rows: np.ndarray) -> "InvertedIndex":
+        # Sort by key, then row, so every posting list is ascending
+        order = np.lexsort((rows, key_codes))
+        postings = rows[order]
+        offsets = np.searchsorted(key_codes[order], np.arange(len(keys) + 1)).astype(np.int64)
+        return cls(keys, offsets, postings)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, object], prefix: str) -> "InvertedIndex":
+        return cls(arrays[f"{prefix}.keys"], arrays[f"{prefix}.offsets"], arrays[f"{prefix}.postings"])
+
+    def to_arrays(self, prefix: str) -> Dict[str, object]:
+        return {
+            f"{prefix}.keys": self.keys,
+            f"{prefix}.offsets": self.offsets,
+            f"{prefix}.postings": self.postings,
+        }
+
+    def get(self, key: str) -> np.ndarray:
+        """Row ids for an exact (case-insensitive) key"""
+        slot = self._slots.get(key.strip().lower())
+        if slot is None:
+            return np.empty(0, dtype=np.int32)
+        return self.postings[self.offsets[slot]:self.offsets[slot + 1]]
+
+    def match(self, text: str) -> np.ndarray:
+        """Row ids whose indexed text contains every token of `text`"""
+        tokens = tokenize(text)
+        if not tokens:
+            return np.empty(0, dtype=np.int32)
+        return intersect(self.get(token) for token in set(tokens))
+
+    def bitmap(self, key: str) -> Bitmap:
+        """get(key) as a bitmap, built on first use and kept for the life of the index"""
+        slot = self._slots.get(key.strip().lower())
+        if slot is None:
+            return Bitmap({})
+        if slot not in self._bitmaps:
+            self._bitmaps[slot] = Bitmap.from_rows(self.postings[self.offsets[slot]:self.offsets[slot + 1]])
+        return self._bitmaps[slot]
+
+    def match_bitmap(self, text: str) -> Bitmap:
+        """match(text) as a bitmap"""
+        tokens = set(tokenize(text))
+        if not tokens:
+            return Bitmap({})
+        return reduce(operator.and_, sorted((self.bitmap(token) for token in tokens), key=len))
+
+    def any_bitmap(self) -> Bitmap:
+        """Rows holding any key; for single-valued columns, the rows where the value is present"""
+        return reduce(operator.or_, (self.bitmap(key) for key in self.keys), Bitmap({}))
+
+
+class SortedIndex:
+    """Row ids ordered by a numeric column for range lookups"""
+
+    def __init__(self, values: np.ndarray, row_ids: np.ndarray):
+        self.values = values
+        self.row_ids = row_ids
+
+    @classmethod
+    def from_values(cls, values) -> "SortedIndex":
+        """Build from one numeric value per row; NaN rows are not indexed"""
+        values = np.asarray(values, dtype=np.float64)
+        rows = np.flatnonzero(~np.isnan(values)).astype(np.int32)
+        order = np.argsort(values[rows], kind="stable")
+        return cls(values[rows][order], rows[order])
+
+    @classmethod
+    def merge(cls, previous: "SortedIndex", remap: np.ndarray,
+              fresh: "SortedIndex", fresh_rows: np.ndarray) -> "SortedIndex":
+        """Combine carried-over entries with entries for re-indexed rows (see InvertedIndex.merge)"""
+        old_rows = remap[previous.row_ids]
+        kept = old_rows >= 0
+        values = np.concatenate([previous.values[kept], fresh.values])
+        rows = np.concatenate([old_rows[kept], fresh_rows[fresh.row_ids]]).astype(np.int32)
+
+        # Both halves are already sorted, so the stable sort only merges two runs
+        order = np.argsort(values, kind="stable")
+        return cls(values[order], rows[order])
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, object], prefix: str) -> "SortedIndex":
+        return cls(arrays[f"{prefix}.values"], arrays[f"{prefix}.row_ids"])
+
+    def to_arrays(self, prefix: str) -> Dict[str, object]:
+        return {
+            f"{prefix}.values": self.values,
+            f"{prefix}.row_ids": self.row_ids,
+        }
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """Sorted row ids with low <= value <= high"""
+        start, stop = self._bounds(low, high)
+        return np.sort(self.row_ids[start:stop])
+
+    def bitmap(self, low: Optional[float] = None, high: Optional[float] = None) -> Bitmap:
+        """range(low, high) as a bitmap"""
+        return Bitmap.from_rows(self.range(low, high))
+
+    def count(self, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        """Number of rows range(low, high) would return, in O(log n)"""
+        start, stop = self._bounds(low, high)
+        return int(stop - start)
+
+    def _bounds(self, low: Optional[float], high: Optional[float]):
+        start = 0 if low is None else np.searchsorted(self.values, low, side="left")
+        stop = len(self.values) if high is None else np.searchsorted(self.values, high, side="right")
+        return start, stop
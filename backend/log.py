@@ -0,0 +1,38 @@
+"""Non-blocking logging: request threads enqueue records, one background thread writes them"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+from config import Config
+
+ROOT_LOGGER = "chatbot"
+
+_listener = None
+
+
+def setup_logging(level: str = None):
+    """Route the app's loggers through a QueueHandler; idempotent, once per process"""
+    global _listener
+    if _listener is not None:
+        return
+
+    records = queue.SimpleQueue()
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _listener = logging.handlers.QueueListener(records, output)
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel((level or Config.LOG_LEVEL).upper())
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.propagate = False
+
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for one module, e.g. get_logger('search_engine')"""
+    setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
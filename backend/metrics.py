@@ -0,0 +1,106 @@
+"""Latency histograms and gauges rendered in the Prometheus text format"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models import ExtractedFilters, READING_FIELDS
+
+# Seconds; chat stages range from microseconds (parse) to seconds (large scans)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label combination"""
+
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][position] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        for labels, (counts, total) in sorted(series.items()):
+            pairs = [f'{name}="{value}"' for name, value in zip(self.label_names, labels)]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                bucket_labels = ','.join(pairs + [f'le="{le}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+            suffix = f"{{{','.join(pairs)}}}" if pairs else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collects histograms plus gauges read from callbacks at scrape time"""
+
+    def __init__(self):
+        self.histograms: List[Histogram] = []
+        self.callbacks: List[Tuple[str, str, str, Callable[[], float]]] = []
+
+    def histogram(self, name: str, help: str, label_names: Tuple[str, ...] = ()) -> Histogram:
+        histogram = Histogram(name, help, label_names)
+        self.histograms.append(histogram)
+        return histogram
+
+    def callback(self, name: str, help: str, read: Callable[[], float], kind: str = "gauge"):
+        """Export a value owned elsewhere (queue depth, cache hits); kind is 'gauge' or 'counter'"""
+        self.callbacks.append((name, help, kind, read))
+
+    def render(self) -> str:
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+        for name, help, kind, read in self.callbacks:
+            lines.extend([f"# HELP {name} {help}", f"# TYPE {name} {kind}", f"{name} {read()}"])
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "chat_stage_seconds",
+    "Time spent in each chat stage, by the set of filters the query used",
+    ("stage", "filters"),
+)
+
+
+def filter_label(filters: ExtractedFilters) -> str:
+    """Names of the filters that are set, e.g. 'bhk+city', or 'none'"""
+    return "+".join(sorted(name for name, value in filters if value is not None and name not in READING_FIELDS)) or "none"
+
+
+def record_stages(label: str, timings: Dict[str, float]):
+    for stage, seconds in timings.items():
+        STAGE_SECONDS.observe(seconds, stage, label)
+
+
+@contextmanager
+def timed(timings: Optional[Dict[str, float]], stage: str):
+    """Add the block's wall time to timings[stage]; a no-op when timings is None"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
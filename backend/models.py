@@ -1,10 +1,19 @@
 """Pydantic models for request/response validation"""
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Annotated, Dict, List, Optional, Union
+
+# Longest message parsed; natural language queries are a sentence or two
+MAX_MESSAGE_LENGTH = 1000
 
 class ChatQuery(BaseModel):
-    message: str = Field(..., description="User's natural language query")
-    session_id: Optional[str] = Field(None, description="Session ID for context")
+    message: str = Field(..., max_length=MAX_MESSAGE_LENGTH, description="User's natural language query")
+    session_id: Optional[str] = Field(None, description="Session ID; follow-up messages refine the session's previous search")
+    limit: int = Field(10, ge=1, le=100, description="Properties per page")
+    cursor: Optional[str] = Field(None, description="next_cursor from the previous page")
+
+class ChatBatchQuery(BaseModel):
+    messages: List[Annotated[str, Field(max_length=MAX_MESSAGE_LENGTH)]] = Field(..., min_length=1, max_length=10000, description="User queries, answered in order")
+    limit: int = Field(10, ge=1, le=100, description="Properties per query")
 
 class PropertyCard(BaseModel):
     project_id: str
@@ -23,17 +32,63 @@ class PropertyCard(BaseModel):
     slug: str
     url: str
 
+# ExtractedFilters fields that describe how the query was read rather than constrain matches
+READING_FIELDS = frozenset({'corrections', 'match_confidence'})
+
+# Largest bathroom count the catalog stores (counts are int8)
+MAX_COUNT = 127
+
+# A 'near' radius past half the Earth's circumference (about 20,000 km) covers every place
+MAX_RADIUS_KM = 20000.0
+
 class ExtractedFilters(BaseModel):
-    city: Optional[str] = None
-    bhk: Optional[str] = None
+    # City, BHK, status, furnishing and parking take one value or a list of alternatives (OR)
+    city: Optional[Union[str, List[str]]] = None
+    bhk: Optional[Union[str, List[str]]] = None
     budget_min: Optional[float] = None
     budget_max: Optional[float] = None
-    possession_status: Optional[str] = None
+    possession_status: Optional[Union[str, List[str]]] = None
     locality: Optional[str] = None
     project_name: Optional[str] = None
+    carpet_area_min: Optional[float] = None
+    carpet_area_max: Optional[float] = None
+    bathrooms_min: Optional[int] = Field(None, ge=0, le=MAX_COUNT)
+    bathrooms_max: Optional[int] = Field(None, ge=0, le=MAX_COUNT)
+    furnishing: Optional[Union[str, List[str]]] = None
+    parking: Optional[Union[str, List[str]]] = None
+    maintenance_max: Optional[float] = None
+    possession_by: Optional[str] = None
+    near: Optional[str] = Field(None, description="Locality or pincode to search around")
+    radius_km: Optional[float] = Field(None, ge=0, le=MAX_RADIUS_KM, description="Search radius around near, in km")
+    exclude: Optional[Dict[str, List[str]]] = Field(None, description="Field -> values a match must not have (NOT)")
+    corrections: Optional[Dict[str, str]] = Field(None, description="Misspelled word -> catalog word it was read as")
+    match_confidence: Optional[float] = Field(None, description="Confidence in the least certain correction, 0-1")
+
+    def accepted(self, field: str) -> List[str]:
+        """Values a field may match: its alternatives, its single value, or none when unset"""
+        value = getattr(self, field)
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
+class MatchStats(BaseModel):
+    total: int
+    cities: List[str] = []
+    localities: List[str] = []
+    bhk_types: List[str] = []
+    avg_price: float = 0
+    price_min: Optional[float] = None
+    price_max: Optional[float] = None
+    ready_count: int = 0
+    under_construction_count: int = 0
+    amenities: List[str] = []
 
 class ChatResponse(BaseModel):
     summary: str = Field(..., description="AI-generated summary")
     properties: List[PropertyCard] = Field(..., description="List of matching properties")
     filters_applied: ExtractedFilters = Field(..., description="Filters extracted from query")
     total_results: int = Field(..., description="Total number of results found")
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
+
+class ChatBatchResponse(BaseModel):
+    results: List[ChatResponse] = Field(..., description="One response per query, in request order")
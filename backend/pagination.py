@@ -0,0 +1,35 @@
+"""Opaque cursors for paging through chat results"""
+import base64
+import hashlib
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that is malformed or belongs to a different query"""
+
+
+def _fingerprint(filters_key: tuple) -> str:
+    return hashlib.sha1(repr(filters_key).encode()).hexdigest()[:12]
+
+
+def encode_cursor(offset: int, filters_key: tuple) -> str:
+    """Cursor resuming at offset for the query whose filters hash to filters_key"""
+    raw = f"{offset}:{_fingerprint(filters_key)}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, filters_key: tuple) -> int:
+    """
+    Offset stored in a cursor
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or was issued for other filters
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        offset, fingerprint = raw.split(":")
+        offset = int(offset)
+    except ValueError:
+        raise InvalidCursor("Malformed cursor")
+    if offset < 0 or fingerprint != _fingerprint(filters_key):
+        raise InvalidCursor("Cursor does not belong to this query")
+    return offset
@@ -0,0 +1,280 @@
+"""
+Chat pipeline: parse, search and summarize one message
+
+Kept out of app.py so process-pool workers can build their own copy
+without importing the web application.
+"""
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from models import ExtractedFilters
+from results import ChatResult
+from query_parser import QueryParser
+from search_engine import SearchEngine
+from sessions import Session, build_session_store, merge_filters, narrowing, starts_over
+from summarizer import Summarizer
+from catalog import TABLES
+from reloader import CatalogReloader
+from cache import ResultCache, filters_key
+from pagination import encode_cursor, decode_cursor
+from ranking import parse_weights
+from metrics import filter_label, record_stages, timed
+from log import get_logger
+from config import Config
+
+logger = get_logger('pipeline')
+
+
+class ChatPipeline:
+    """Answer chat messages from the current catalog snapshot"""
+
+    def __init__(self, reloader: CatalogReloader, cache: Optional[ResultCache] = None,
+                 sessions=None, session_max_rows: int = 100000):
+        """
+        Args:
+            reloader: Holds the current engine
+            cache: Response cache, or None for no caching
+            sessions: Session store (see sessions.build_session_store), or None to ignore session ids
+            session_max_rows: Matches kept per session for narrowing follow-ups; larger sets are searched afresh
+        """
+        self.reloader = reloader
+        self.parser = QueryParser(gazetteer=reloader.engine.gazetteer, places=reloader.engine.places)
+        self.summarizer = Summarizer()
+        self.cache = cache if cache is not None else ResultCache(max_entries=0)
+        self.sessions = sessions
+        self.session_max_rows = session_max_rows
+        # Receives (filters label, seconds per stage) for every request
+        self.record = record_stages
+        reloader.on_reload(self._on_reload)
+
+    @classmethod
+    def from_config(cls, poll_interval: Optional[float] = None) -> "ChatPipeline":
+        """
+        Build the engine, reloader and cache from Config
+
+        Args:
+            poll_interval: Seconds between data file checks, or None for RELOAD_INTERVAL; 0 disables watching
+        """
+        weights = parse_weights(Config.RANK_WEIGHTS)
+        reloader = CatalogReloader(
+            lambda previous: SearchEngine(
+                data_path=Config.DATA_PATH,
+                normalized=Config.NORMALIZED_STORAGE,
+                snapshot_path=Config.SNAPSHOT_PATH,
+                mmap=Config.MMAP_DATASET,
+                previous=previous,
+                weights=weights,
+                places_path=Config.PLACES_PATH,
+            ),
+            watch_paths=[f"{Config.DATA_PATH}{filename}" for filename, _ in TABLES.values()],
+            poll_interval=Config.RELOAD_INTERVAL if poll_interval is None else poll_interval,
+        )
+        cache = ResultCache(max_entries=Config.CACHE_MAX_ENTRIES, ttl=Config.CACHE_TTL)
+        sessions = build_session_store(Config.SESSION_STORE, Config.SESSION_MAX, Config.SESSION_TTL)
+        return cls(reloader, cache, sessions, Config.SESSION_MAX_ROWS)
+
+    def _on_reload(self, engine: SearchEngine):
+        """Point the parser at the new catalog vocabulary and drop stale responses"""
+        self.parser.gazetteer = engine.gazetteer
+        self.parser.places = engine.places
+        self.cache.clear()
+
+    def run(self, message: str, limit: int = 10, cursor: Optional[str] = None,
+            session_id: Optional[str] = None) -> ChatResult:
+        """
+        Process one chat message
+
+        Args:
+            message: User's natural language query
+            limit: Properties per page
+            cursor: next_cursor of the previous page, or None for the first page
+            session_id: Conversation the message continues, or None for a standalone query
+
+        Returns:
+            ChatResult with summary, one page of properties and the total match count
+
+        Raises:
+            InvalidCursor: If cursor was not issued for this query
+        """
+        # The last event carries the complete response
+        for _, payload in self.stream(message, limit, cursor, session_id):
+            pass
+        return payload
+
+    def stream(self, message: str, limit: int = 10, cursor: Optional[str] = None,
+               session_id: Optional[str] = None) -> Iterator[Tuple[str, object]]:
+        """
+        Process one chat message as a sequence of events
+
+        Yields ('filters', ExtractedFilters) as soon as the query is parsed,
+        then ('property', PropertyResult) for each card on the page, then
+        ('summary', ChatResult) once the summary is written.
+
+        In a session, the message's filters are merged into the previous
+        message's. When that only narrows the previous search, just the new
+        filters are applied to its matches instead of to the whole catalog.
+
+        Raises:
+            InvalidCursor: If cursor was not issued for this query
+        """
+        timings = {}
+
+        # 1. Parse query (LOCAL - regex based)
+        with timed(timings, 'parse'):
+            filters = self.parser.parse(message)
+        session = None
+        if session_id and self.sessions is not None and not starts_over(message):
+            session = self.sessions.get(session_id)
+            if session is not None:
+                filters = merge_filters(session.filters, filters)
+        logger.debug("Query %r -> %s", message, filters)
+        key = filters_key(filters)
+        offset = decode_cursor(cursor, key) if cursor else 0
+        yield 'filters', filters
+
+        # Queries that parse to the same filters share one response per data generation and page
+        generation, engine = self.reloader.generation, self.reloader.engine
+        cache_key = (generation, key, offset, limit)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Cache hit")
+            if session_id:
+                # Matches are only known when the session already had them
+                same = session is not None and session.generation == generation and filters_key(session.filters) == key
+                self._remember(session_id, filters, session.row_ids if same else None, generation)
+            self.record(filter_label(filters), timings)
+            yield from response_events(cached, include_filters=False)
+            return
+
+        # 2. Search properties (LOCAL - index lookups on the current snapshot)
+        narrow = None
+        if session is not None and session.row_ids is not None and session.generation == generation:
+            refinement = narrowing(session.filters, filters)
+            if refinement is not None:
+                narrow = (session.row_ids, refinement)
+        page = engine.search_page(filters, offset=offset, limit=limit, timings=timings, with_stats=True, narrow=narrow)
+        if session_id:
+            self._remember(session_id, filters, page.row_ids, generation)
+        properties, total = page.cards, page.total
+        logger.debug("Found %d properties, returning %d from offset %d", total, len(properties), offset)
+        for card in properties:
+            yield 'property', card
+
+        # 3. Generate summary (LOCAL - rule based)
+        with timed(timings, 'summarize'):
+            summary = self.summarizer.generate_summary(page.stats, filters)
+        logger.debug("Generated summary: %.100s", summary)
+
+        response = ChatResult(
+            summary=summary,
+            properties=properties,
+            filters_applied=filters,
+            total_results=total,
+            next_cursor=encode_cursor(offset + limit, key) if offset + limit < total else None
+        )
+        self.cache.put(cache_key, response)
+        self.record(filter_label(filters), timings)
+        yield 'summary', response
+
+    def _remember(self, session_id: str, filters: ExtractedFilters, row_ids: Optional[np.ndarray], generation: int):
+        """Save a session's filters, and its matches when there are few enough to narrow later"""
+        if self.sessions is None:
+            return
+        if row_ids is not None and len(row_ids) > self.session_max_rows:
+            row_ids = None
+        self.sessions.put(session_id, Session(filters, row_ids, generation))
+
+    def run_batch(self, messages: List[str], limit: int = 10) -> List[ChatResult]:
+        """
+        Process many chat messages together
+
+        Messages that parse to the same filters share one response; the
+        rest are searched in a single SearchEngine.search_batch call.
+
+        Args:
+            messages: User queries
+            limit: Properties per response
+
+        Returns:
+            One ChatResult (first page) per message, in input order
+        """
+        timings = {}
+        with timed(timings, 'parse'):
+            all_filters = [self.parser.parse(message) for message in messages]
+        keys = [filters_key(filters) for filters in all_filters]
+
+        generation, engine = self.reloader.generation, self.reloader.engine
+        responses = {}
+        misses = {}
+        for key, filters in zip(keys, all_filters):
+            if key in responses or key in misses:
+                continue
+            cached = self.cache.get((generation, key, 0, limit))
+            if cached is not None:
+                responses[key] = cached
+            else:
+                misses[key] = filters
+
+        with timed(timings, 'search'):
+            pages = engine.search_batch(list(misses.values()), limit=limit, with_stats=True)
+        for (key, filters), page in zip(misses.items(), pages):
+            with timed(timings, 'summarize'):
+                summary = self.summarizer.generate_summary(page.stats, filters)
+            response = ChatResult(
+                summary=summary,
+                properties=page.cards,
+                filters_applied=filters,
+                total_results=page.total,
+                next_cursor=encode_cursor(limit, key) if limit < page.total else None
+            )
+            self.cache.put((generation, key, 0, limit), response)
+            responses[key] = response
+
+        logger.debug("Batch of %d queries: %d distinct, %d searched", len(messages), len(responses), len(misses))
+        self.record('batch', timings)
+        return [responses[key] for key in keys]
+
+
+def response_events(response: ChatResult, include_filters: bool = True) -> Iterator[Tuple[str, object]]:
+    """Replay a finished response as the events ChatPipeline.stream produces"""
+    if include_filters:
+        yield 'filters', response.filters_applied
+    for card in response.properties:
+        yield 'property', card
+    yield 'summary', response
+
+
+# Per-process pipeline for process-pool workers; stage timings are buffered
+# and handed back with each result so the parent's /metrics includes them
+_worker_pipeline: Optional[ChatPipeline] = None
+_worker_timings: List[Tuple[str, Dict[str, float]]] = []
+
+
+def init_worker():
+    """Process-pool initializer: load the dataset once per worker"""
+    global _worker_pipeline
+    # The parent watches the data files and restarts the pool on reload, so workers never poll
+    _worker_pipeline = ChatPipeline.from_config(poll_interval=0)
+    _worker_pipeline.record = lambda label, timings: _worker_timings.append((label, timings))
+
+
+def _drain_timings() -> List[Tuple[str, Dict[str, float]]]:
+    drained = list(_worker_timings)
+    _worker_timings.clear()
+    return drained
+
+
+def run_in_worker(message: str, limit: int = 10, cursor: Optional[str] = None,
+                  session_id: Optional[str] = None) -> Tuple[ChatResult, list]:
+    """Run one message in a worker; returns the response and the stage timings to record"""
+    _worker_timings.clear()
+    response = _worker_pipeline.run(message, limit, cursor, session_id)
+    return response, _drain_timings()
+
+
+def run_batch_in_worker(messages: List[str], limit: int = 10) -> Tuple[List[ChatResult], list]:
+    """Run a batch in a worker; returns the responses and the stage timings to record"""
+    _worker_timings.clear()
+    responses = _worker_pipeline.run_batch(messages, limit)
+    return responses, _drain_timings()
@@ -1,103 +1,382 @@
 """Natural Language Query Parser"""
+import calendar
 import re
-from typing import Optional
-from models import ExtractedFilters
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from models import ExtractedFilters, MAX_COUNT, MAX_RADIUS_KM
+from gazetteer import Gazetteer, GENERIC_TERMS, LOCALITY
+from geo import Places
+from fuzzy import TrigramIndex, similarity
+from index import TOKEN_PATTERN, tokenize
+
+BUDGET_NUMBER = r'₹?\s*(\d+\.?\d*)'
+CRORE = r'(?:cr|crore|crores)'
+LAKH = r'(?:l|lakh|lakhs)'
+
+MULTIPLIERS = {'cr': 10000000, 'l': 100000}
+
+SQFT = r'(?:sq\.?\s*ft|sqft|sft|square\s*f(?:ee|oo)t)'
+BATHROOMS = r'(?:bathrooms?|baths?|toilets?)'
+MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+
+# Text joining two mentions of one field into alternatives ('Pune or Mumbai', '2BHK/3BHK')
+ALTERNATIVE = re.compile(r'\s*(?:,\s*)?(?:or|and|/|,)\s*(?:in\s+)?')
+# Text just before a mention that excludes it ('not in Mumbai', 'except under construction')
+NEGATION_WORDS = r'\b(?:not|no|except|excluding|without|other than)\s'
+NEGATION = re.compile(NEGATION_WORDS + r'+(?:in\s+)?$')
+NEGATION_WINDOW = 16
+HAS_NEGATION = re.compile(NEGATION_WORDS)
+
+# Shorter words are never corrected; longer ones may be two edits off instead of one
+MIN_FUZZY_LENGTH = 5
+LONG_WORD_LENGTH = 8
+# Unknown words looked up per query; each kept correction costs a scan of the query, so this bounds the work
+MAX_FUZZY_WORDS = 8
+FUZZY_CANDIDATE = re.compile(rf'(?<![a-z0-9])[a-z]{{{MIN_FUZZY_LENGTH},}}(?![a-z0-9])')
+
+# Everyday query words, never corrected toward a city, locality or project name
+QUERY_WORDS = {
+    'show', 'find', 'search', 'looking', 'want', 'need', 'please', 'something', 'anything', 'options',
+    'flat', 'flats', 'apartment', 'apartments', 'home', 'homes', 'house', 'houses', 'villa', 'villas',
+    'property', 'properties', 'bedroom', 'bedrooms', 'bathroom', 'bathrooms', 'toilet', 'toilets',
+    'budget', 'price', 'priced', 'costing', 'lakh', 'lakhs', 'crore', 'crores', 'rupees',
+    'under', 'below', 'above', 'between', 'within', 'starting', 'minimum', 'maximum', 'least', 'atleast',
+    'near', 'nearby', 'close', 'around', 'kilometer', 'kilometers', 'kilometre', 'kilometres',
+    'ready', 'possession', 'handover', 'delivery', 'construction', 'launch', 'upcoming', 'immediate',
+    'maintenance', 'charges', 'square', 'sqft', 'carpet', 'area', 'furnished', 'parking', 'covered',
+    'except', 'excluding', 'without', 'other', 'having', 'which', 'where', 'there', 'their',
+    'cheap', 'affordable', 'luxury', 'spacious', 'family', 'available', 'good', 'nice', 'best',
+} | {month.lower() for month in calendar.month_name if month}
+
+KILOMETRES = r'(?:km|kms|kilomet(?:er|re)s?)'
+# A place after 'near' or '5 km from', up to punctuation or the next clause; read
+# in a look-ahead so the words of the place are still scanned for other filters
+PLACE = (r"(?=(?:the\s+)?(?P<{}>[a-z0-9][a-z0-9 '&-]*?)(?=\s*(?:[,.;!?()]|$|\b(?:under|below|within|with|for"
+         r"|in|and|or|ready|budget|upto|having|which|that|not|except)\b)))")
+
 
 class QueryParser:
     """Parse natural language queries to extract structured filters"""
-    
+
     CITIES = {
         'mumbai': ['mumbai', 'bombay', 'navi mumbai', 'chembur'],
         'pune': ['pune', 'pimpri', 'chinchwad', 'shivajinagar', 'wakad', 'baner'],
         'bangalore': ['bangalore', 'bengaluru'],
         'delhi': ['delhi', 'new delhi', 'ncr']
     }
-    
-    BHK_PATTERNS = [
-        (r'(\d+)\s*bhk', lambda m: f"{m.group(1)}BHK"),
-        (r'(one|1)\s*bedroom', lambda m: "1BHK"),
-        (r'(two|2)\s*bedroom', lambda m: "2BHK"),
-        (r'(three|3)\s*bedroom', lambda m: "3BHK"),
-        (r'(four|4)\s*bedroom', lambda m: "4BHK"),
-    ]
-    
+
+    BHK_WORDS = {'one': 1, 'two': 2, 'three': 3, 'four': 4, '1': 1, '2': 2, '3': 3, '4': 4}
+
     POSSESSION_KEYWORDS = {
         'ready to move': ['ready', 'immediate', 'ready to move', 'rtm'],
         'under construction': ['under construction', 'upcoming', 'new launch']
     }
-    
-    def parse(self, query: str) -> ExtractedFilters:
-        query_lower = query.lower()
-        
-        return ExtractedFilters(
-            city=self._extract_city(query_lower),
-            bhk=self._extract_bhk(query_lower),
-            budget_min=self._extract_budget_min(query_lower),
-            budget_max=self._extract_budget_max(query_lower),
-            possession_status=self._extract_possession_status(query_lower),
-            locality=self._extract_locality(query_lower),
-            project_name=self._extract_project_name(query_lower)
-        )
-    
-    def _extract_city(self, query: str) -> Optional[str]:
-        for city, variations in self.CITIES.items():
+
+    FURNISHING_KEYWORDS = {
+        'semi furnished': ['semi furnished', 'semi-furnished', 'semifurnished'],
+        'unfurnished': ['unfurnished', 'non furnished', 'non-furnished', 'bare shell'],
+        'furnished': ['furnished', 'fully furnished', 'fully-furnished'],
+    }
+
+    PARKING_KEYWORDS = {
+        'covered': ['covered parking', 'covered car parking', 'stilt parking', 'basement parking'],
+        'open': ['open parking', 'open car parking'],
+        'any': ['parking', 'car parking', 'with parking'],
+    }
+
+    MAX_WORDS = r'(?:under|below|upto|up to|within|max|maximum|less than|at most)'
+    MIN_WORDS = r'(?:above|over|from|starting from|minimum|min|more than|at least|atleast)'
+
+    def __init__(self, gazetteer: Optional[Gazetteer] = None, places: Optional[Places] = None):
+        """
+        Args:
+            gazetteer: Catalog localities and project names; replaced on reload
+            places: Locality/pincode centroids that 'near' places resolve to
+        """
+        self.gazetteer = gazetteer
+        self.places = places
+
+        # City spellings a misspelled word may be corrected to; words of every keyword are taken as spelled
+        self.city_words = TrigramIndex(Counter(
+            token for variations in self.CITIES.values() for variation in variations for token in tokenize(variation)
+        ))
+
+        # keyword -> (field, value, priority); lower priority wins, mirroring dict order
+        self.keywords: Dict[str, Tuple[str, str, int]] = {}
+        for rank, (city, variations) in enumerate(self.CITIES.items()):
             for variation in variations:
-                if variation in query:
-                    return city.title()
-        return None
-    
-    def _extract_bhk(self, query: str) -> Optional[str]:
-        for pattern, formatter in self.BHK_PATTERNS:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                return formatter(match)
-        return None
-    
-    def _extract_budget_max(self, query: str) -> Optional[float]:
-        cr_pattern = r'(?:under|below|upto|up to|within|max|maximum)\s*₹?\s*(\d+\.?\d*)\s*(?:cr|crore|crores)'
-        match = re.search(cr_pattern, query, re.IGNORECASE)
-        if match:
-            return float(match.group(1)) * 10000000
-        
-        lakh_pattern = r'(?:under|below|upto|up to|within|max|maximum)\s*₹?\s*(\d+\.?\d*)\s*(?:l|lakh|lakhs)'
-        match = re.search(lakh_pattern, query, re.IGNORECASE)
-        if match:
-            return float(match.group(1)) * 100000
-        
-        return None
-    
-    def _extract_budget_min(self, query: str) -> Optional[float]:
-        cr_pattern = r'(?:above|over|from|starting from|minimum|min)\s*₹?\s*(\d+\.?\d*)\s*(?:cr|crore|crores)'
-        match = re.search(cr_pattern, query, re.IGNORECASE)
-        if match:
-            return float(match.group(1)) * 10000000
-        
-        range_pattern = r'between\s*₹?\s*(\d+\.?\d*)\s*(?:-|to|and)\s*₹?\s*(\d+\.?\d*)\s*(?:cr|crore)'
-        match = re.search(range_pattern, query, re.IGNORECASE)
-        if match:
-            return float(match.group(1)) * 10000000
-        
-        return None
-    
-    def _extract_possession_status(self, query: str) -> Optional[str]:
-        for status, keywords in self.POSSESSION_KEYWORDS.items():
+                self.keywords.setdefault(variation, ('city', city.title(), rank))
+        for rank, (status, keywords) in enumerate(self.POSSESSION_KEYWORDS.items()):
+            for keyword in keywords:
+                self.keywords.setdefault(keyword, ('possession_status', status.title(), rank))
+        for rank, (furnishing, keywords) in enumerate(self.FURNISHING_KEYWORDS.items()):
+            for keyword in keywords:
+                self.keywords.setdefault(keyword, ('furnishing', furnishing.title(), rank))
+        for rank, (parking, keywords) in enumerate(self.PARKING_KEYWORDS.items()):
             for keyword in keywords:
-                if keyword in query:
-                    return status.title()
-        return None
-    
-    def _extract_locality(self, query: str) -> Optional[str]:
-        locality_pattern = r'(?:in|at|near)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-        match = re.search(locality_pattern, query)
-        if match:
-            potential_locality = match.group(1)
-            if potential_locality.lower() not in ['pune', 'mumbai', 'bangalore', 'delhi']:
-                return potential_locality
-        return None
-    
-    def _extract_project_name(self, query: str) -> Optional[str]:
-        project_pattern = r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:project|apartments|residency|heights|towers)'
-        match = re.search(project_pattern, query)
-        if match:
-            return match.group(1)
-        return None
+                self.keywords.setdefault(keyword, ('parking', parking.title(), rank))
+
+        # Longest keywords first so 'ready to move' wins over 'ready' at the same position
+        keyword_alternation = '|'.join(
+            re.escape(keyword) for keyword in sorted(self.keywords, key=len, reverse=True)
+        )
+        self.known_words = QUERY_WORDS | GENERIC_TERMS | {
+            token for keyword in self.keywords for token in tokenize(keyword)
+        }
+
+        bhk_words = '|'.join(self.BHK_WORDS)
+        months = '|'.join(MONTHS)
+
+        # One scanner for every extractor; budget, area and date patterns come before
+        # keywords so 'under 50 lakhs' is read as a budget and 'under construction'
+        # as a status, and 'ready by 2026' as a possession date
+        # Python's re tries every alternative at every position, so size and bathroom
+        # counts share the number-led and budget-word alternatives instead of adding their own
+        self.pattern = re.compile('|'.join([
+            rf'(?<![-\d])(?P<number>\d+)\s*(?:(?P<bhk>bhk)|(?P<separator>-|to|and|or|/|,)\s*(?P<high>\d+)\s*'
+            rf'(?:(?P<area_range>{SQFT})|(?P<bhk_range>bhk)|(?P<bath_range>{BATHROOMS}))'
+            rf'|(?P<area>{SQFT})(?:\s*(?:-|to|and)\s*(?P<area_high>\d+)\s*{SQFT})?|(?P<bath_plus>\+)?\s*(?P<bath>{BATHROOMS})'
+            rf'|(?P<decimal>\.\d+)?\s*{KILOMETRES}\s*(?:of|from|around|near)\s+{PLACE.format("radius_place")})',
+            rf'(?<![-\d])(?P<count>{bhk_words})\s*(?:(?P<bedroom>bedroom)|(?P<bath_word>{BATHROOMS}))',
+            rf'{self.MAX_WORDS}\s*{BUDGET_NUMBER.replace("(", "(?P<max>", 1)}\s*(?:(?P<max_cr>{CRORE})|(?P<area_max>{SQFT})|{LAKH})',
+            rf'{self.MIN_WORDS}\s*{BUDGET_NUMBER.replace("(", "(?P<min>", 1)}\s*(?:{CRORE}|(?P<area_min>{SQFT})|(?P<bath_min>{BATHROOMS}))',
+            rf'between\s*{BUDGET_NUMBER.replace("(", "(?P<between>", 1)}\s*(?:-|to|and)\s*{BUDGET_NUMBER.replace("(", "(?:", 1)}\s*(?:cr|crore)',
+            rf'maintenance\s*(?:charges?\s*)?(?:of\s*)?{self.MAX_WORDS}\s*₹?\s*(?P<maintenance>\d+\.?\d*)\s*(?P<maintenance_k>k\b)?',
+            rf'(?:possession|ready|handover|delivery)\s*(?:by|before|in)\s*(?:(?P<month>{months})[a-z]*\.?\s*)?(?P<year>20\d\d)',
+            rf'\b(?:near(?:by)?|close to|next to)\s+{PLACE.format("near_place")}',
+            rf'\b(?P<keyword>{keyword_alternation})\b',
+        ]))
+
+    def parse(self, query: str) -> ExtractedFilters:
+        """
+        Extract every filter in a single scan of the query
+
+        Each field keeps the candidate with the best priority, then the
+        earliest position, so results match running the extractors one by one.
+        Mentions of city, BHK, status, furnishing or parking joined by 'or'
+        (or 'and', ',', '/') become alternatives, and a mention after 'not',
+        'except' and the like an exclusion. 'near X' and '5 km from X' search
+        around the place X instead of matching it as a locality. Unknown words
+        a typo or two away from a city, locality or project word are read as
+        that word when that names a city, catalog entity or place the query
+        did not, and the corrections are reported with their confidence.
+        """
+        candidates: Dict[str, Tuple[int, object]] = {}
+        # Field -> (end, values, negated) of its latest mention
+        mentions: Dict[str, Tuple[int, List[str], bool]] = {}
+        exclusions: Dict[str, List[List[str]]] = {}
+
+        def offer(field: str, priority: int, value):
+            if field not in candidates or priority < candidates[field][0]:
+                candidates[field] = (priority, value)
+
+        def mention(field: str, priority: int, values: List[str], start: int, end: int):
+            previous = mentions.get(field)
+            if previous is not None and ALTERNATIVE.fullmatch(query_lower, previous[0], start):
+                _, alternatives, negated = previous
+                alternatives.extend(value for value in values if value not in alternatives)
+            else:
+                alternatives = values
+                negated = negations and NEGATION.search(query_lower, max(0, start - NEGATION_WINDOW), start) is not None
+                if negated:
+                    exclusions.setdefault(field, []).append(alternatives)
+            mentions[field] = (end, alternatives, negated)
+            if not negated:
+                offer(field, priority, alternatives)
+
+        query_lower = query.lower()
+        corrections = self._corrections(query_lower)
+        if corrections:
+            query_lower = _corrected(query_lower, corrections)
+        # Most queries negate nothing, so mentions skip the look-behind unless a negation word appears
+        negations = HAS_NEGATION.search(query_lower) is not None
+        for match in self.pattern.finditer(query_lower):
+            group = match.lastgroup
+            if group == 'bhk':
+                mention('bhk', 0, [f"{match.group('number')}BHK"], match.start(), match.end())
+            elif group == 'bhk_range':
+                # '2-4 bhk' spans the counts between (at most MAX_COUNT more), '2 or 4 bhk' names just the two
+                low, high = int(match.group('number')), int(match.group('high'))
+                if match.group('separator') in ('-', 'to') and low < high:
+                    counts = range(low, min(high, low + MAX_COUNT) + 1)
+                else:
+                    counts = (low, high)
+                mention('bhk', 0, [f"{count}BHK" for count in counts], match.start(), match.end())
+            elif group == 'bedroom':
+                count = self.BHK_WORDS[match.group('count')]
+                mention('bhk', count, [f"{count}BHK"], match.start(), match.end())
+            elif group in ('max', 'max_cr'):
+                # Crore amounts take precedence over lakh amounts
+                unit = 'cr' if match.group('max_cr') else 'l'
+                offer('budget_max', 0 if unit == 'cr' else 1, float(match.group('max')) * MULTIPLIERS[unit])
+            elif group == 'min':
+                offer('budget_min', 0, float(match.group('min')) * MULTIPLIERS['cr'])
+            elif group == 'between':
+                offer('budget_min', 1, float(match.group('between')) * MULTIPLIERS['cr'])
+            elif group in ('area_range', 'area_high'):
+                # '900-1200 sqft' or '900 sqft to 1200 sqft'
+                offer('carpet_area_min', 0, float(match.group('number')))
+                offer('carpet_area_max', 0, float(match.group('high') or match.group('area_high')))
+            elif group == 'area':
+                # A bare size ('900 sqft') is read as a minimum
+                offer('carpet_area_min', 0, float(match.group('number')))
+            elif group == 'area_min':
+                offer('carpet_area_min', 0, float(match.group('min')))
+            elif group == 'area_max':
+                offer('carpet_area_max', 0, float(match.group('max')))
+            elif group in ('bath', 'bath_word'):
+                # '2 bathrooms' is exact, '2+ bathrooms' a minimum
+                count = _count(match.group('number')) if group == 'bath' else self.BHK_WORDS[match.group('count')]
+                offer('bathrooms_min', 0, count)
+                if not match.group('bath_plus'):
+                    offer('bathrooms_max', 0, count)
+            elif group == 'bath_range':
+                # '2-3 bathrooms' or '2 or 3 bathrooms' allows every count between
+                low, high = sorted((_count(match.group('number')), _count(match.group('high'))))
+                offer('bathrooms_min', 0, low)
+                offer('bathrooms_max', 0, high)
+            elif group == 'bath_min':
+                offer('bathrooms_min', 0, _count(match.group('min')))
+            elif group in ('maintenance', 'maintenance_k'):
+                offer('maintenance_max', 0, float(match.group('maintenance')) * (1000 if match.group('maintenance_k') else 1))
+            elif group == 'year':
+                offer('possession_by', 0, _month_end(int(match.group('year')), match.group('month')))
+            elif group in ('near_place', 'radius_place'):
+                if group == 'radius_place':
+                    radius_km = float(match.group('number') + (match.group('decimal') or ''))
+                    offer('radius_km', 0, min(radius_km, MAX_RADIUS_KM))
+                offer('near', 0, match.group(group))
+            elif group == 'keyword':
+                field, value, priority = self.keywords[match.group('keyword')]
+                mention(field, priority, [value], match.start(), match.end())
+
+        near = ''
+        if 'near' in candidates:
+            near = ''.join(tokenize(candidates['near'][1]))
+            candidates['near'] = (0, self._place(candidates['near'][1]))
+
+        # Localities and project names resolve to canonical catalog entities
+        gazetteer = self.gazetteer
+        if gazetteer is not None:
+            for entities in gazetteer.find(query_lower):
+                # A phrase naming both a locality and a project is read as the locality
+                kind, key = min(entities, key=lambda entity: entity[0] != LOCALITY)
+                if near and key in near:
+                    continue  # the place searched around, not a locality to match
+                field = 'locality' if kind == LOCALITY else 'project_name'
+                offer(field, 0, gazetteer.name(kind, key))
+
+        # A choice field named once keeps its plain value
+        filters = {
+            field: value[0] if field in mentions and len(value) == 1 else value
+            for field, (_, value) in candidates.items()
+        }
+        if exclusions:
+            filters['exclude'] = {
+                field: list(dict.fromkeys(value for alternatives in mentioned for value in alternatives))
+                for field, mentioned in exclusions.items()
+            }
+        if corrections:
+            filters['corrections'] = {typed: word for typed, (word, _) in corrections.items()}
+            filters['match_confidence'] = round(min(confidence for _, confidence in corrections.values()), 2)
+        return ExtractedFilters(**filters)
+
+    def _corrections(self, text: str) -> Dict[str, Tuple[str, float]]:
+        """
+        Misspelled words of the text, each with the closest city, catalog
+        (locality or project) or places-table word and the confidence in that correction
+
+        Only words no vocabulary knows are looked up, through trigram indexes,
+        so correctly spelled queries cost a few set lookups; only the first
+        MAX_FUZZY_WORDS unknown words are considered. A correction is
+        kept only when it makes the text name a city, catalog entity or place
+        it did not ('garden facing' stays as typed), and never toward a word's
+        plural or singular ('hills' is not a misspelled 'hill').
+        """
+        corrections = {}
+        candidates = [token for token in FUZZY_CANDIDATE.findall(text) if token not in self.known_words]
+        if not candidates:
+            return corrections
+
+        vocabularies = [self.city_words]
+        if self.gazetteer is not None:
+            vocabularies.append(self.gazetteer.words)
+        if self.places is not None:
+            vocabularies.append(self.places.words)
+
+        unknown = [token for token in dict.fromkeys(candidates) if not any(token in words for words in vocabularies)]
+        for token in unknown[:MAX_FUZZY_WORDS]:
+            max_distance = 1 if len(token) < LONG_WORD_LENGTH else 2
+            # Closest of each vocabulary's best word; earlier vocabularies win ties
+            matches = [words.lookup(token, max_distance)[:1] for words in vocabularies]
+            matches = [match for best in matches for match in best]
+            if matches:
+                word, distance = min(matches, key=lambda match: match[1])
+                if not _inflection(token, word):
+                    corrections[token] = (word, similarity(token, word, distance))
+        if not corrections:
+            return corrections
+
+        # Keep the corrections that name something new, dropping any the rest name it without
+        before = self._entities(text)
+        gained = self._entities(_corrected(text, corrections)) - before
+        if not gained:
+            return {}
+        for token in list(corrections):
+            rest = {typed: correction for typed, correction in corrections.items() if typed != token}
+            if self._entities(_corrected(text, rest)) - before >= gained:
+                corrections = rest
+        return corrections
+
+    def _entities(self, text: str) -> set:
+        """Cities, catalog entities and 'near' places the text names, as (kind, key) pairs"""
+        entities = set()
+        for match in self.pattern.finditer(text):
+            group = match.lastgroup
+            if group == 'keyword':
+                field, value, _ = self.keywords[match.group('keyword')]
+                if field == 'city':
+                    entities.add(('city', value))
+            elif group in ('near_place', 'radius_place') and self.places is not None:
+                place = self.places.resolve(match.group(group))
+                if place is not None:
+                    entities.add(('place', place))
+        if self.gazetteer is not None:
+            for mention in self.gazetteer.find(text):
+                entities.update(mention)
+        return entities
+
+    def _place(self, text: str) -> str:
+        """Canonical name of a place after 'near': a known locality or pincode, else a catalog locality, else the text"""
+        if self.places is not None:
+            place = self.places.resolve(text)
+            if place is not None:
+                return place
+        if self.gazetteer is not None and self.gazetteer.project_ids(LOCALITY, text) is not None:
+            return self.gazetteer.name(LOCALITY, ''.join(tokenize(text)))
+        return ' '.join(text.split()).title()
+
+
+def _count(number: str) -> int:
+    """A bathroom count as typed, capped at the largest the catalog stores"""
+    return min(int(float(number)), MAX_COUNT)
+
+
+def _corrected(text: str, corrections: Dict[str, Tuple[str, float]]) -> str:
+    """Text with each corrected word replaced"""
+    return TOKEN_PATTERN.sub(
+        lambda match: corrections[match.group()][0] if match.group() in corrections else match.group(), text
+    )
+
+
+def _inflection(word: str, match: str) -> bool:
+    """Whether one word is the other with a plural ending ('hills'/'hill', 'garden'/'gardens')"""
+    shorter, longer = sorted((word, match), key=len)
+    return longer in (shorter + 's', shorter + 'es')
+
+
+def _month_end(year: int, month: Optional[str]) -> str:
+    """ISO date of the last day of the named month, or of the year when no month is given"""
+    number = MONTHS.index(month) + 1 if month else 12
+    last_day = calendar.monthrange(year, number)[1]
+    return f"{year:04d}-{number:02d}-{last_day:02d}"
@@ -0,0 +1,124 @@
+"""Relevance ranking over candidate rows"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from models import ExtractedFilters
+
+DEFAULT_WEIGHTS = {
+    'budget': 1.0,      # price close to the stated budget
+    'bhk': 1.0,         # configuration type equals the requested BHK
+    'locality': 1.0,    # landmark names the requested locality
+    'recency': 0.5,     # recently updated listings
+    'possession': 0.5,  # earlier possession date
+}
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """
+    Parse 'budget=1,recency=0.25' into weights, filling the rest from DEFAULT_WEIGHTS
+
+    Raises:
+        ValueError: On an unknown feature name or a non-numeric weight
+    """
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, value = item.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_WEIGHTS:
+            raise ValueError(f"Unknown ranking feature: {name}")
+        weights[name] = float(value)
+    return weights
+
+
+def _scaled(values: np.ndarray) -> np.ndarray:
+    """Min-max scale to [0, 1] within the candidates; missing values score 0"""
+    present = ~np.isnan(values)
+    if not present.any():
+        return np.zeros(len(values))
+    low, high = values[present].min(), values[present].max()
+    if high == low:
+        return present.astype(float)
+    return np.where(present, (values - low) / (high - low), 0.0)
+
+
+def _category_match(values: pd.Series, target: str) -> np.ndarray:
+    """Case-insensitive substring test evaluated once per category instead of once per row"""
+    target = target.lower()
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.cat.categories.str.lower().str.contains(target, regex=False)
+        codes = values.cat.codes.to_numpy()
+        return np.where(codes >= 0, np.append(categories, False)[codes], False)
+    return values.fillna('').str.lower().str.contains(target, regex=False).to_numpy()
+
+
+class Ranker:
+    """
+    Score candidate rows and keep the best k
+
+    Each feature is scaled to [0, 1] and the score is their weighted sum.
+    Selection uses a partial sort, so ranking n candidates for a page
+    ending at k costs O(n + k log k) rather than a full O(n log n) sort.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+
+    def score(self, catalog, filters: ExtractedFilters, row_ids: np.ndarray) -> np.ndarray:
+        """Weighted relevance score of every candidate row"""
+        weights = self.weights
+        scores = np.zeros(len(row_ids))
+
+        target = filters.budget_max or filters.budget_min
+        if target and weights['budget']:
+            prices = catalog.column('price_raw', row_ids).to_numpy(dtype=float)
+            closeness = np.clip(1 - np.abs(prices - target) / target, 0, 1)
+            scores += weights['budget'] * np.where(prices > 0, closeness, 0.0)
+
+        if filters.bhk and weights['bhk']:
+            scores += weights['bhk'] * catalog.column('bhk', row_ids).isin(filters.accepted('bhk')).to_numpy(dtype=float)
+
+        if filters.locality and weights['locality']:
+            scores += weights['locality'] * _category_match(catalog.column('locality', row_ids), filters.locality)
+
+        if weights['recency']:
+            scores += weights['recency'] * _scaled(catalog.column('updated_ts', row_ids).to_numpy(dtype=float))
+
+        if weights['possession']:
+            # Earlier possession ranks higher
+            scores += weights['possession'] * _scaled(-catalog.column('possession_ts', row_ids).to_numpy(dtype=float))
+
+        return scores
+
+    def top_k(self, catalog, filters: ExtractedFilters, row_ids: np.ndarray, k: int) -> np.ndarray:
+        """
+        The k best rows, best first
+
+        Ties are broken by row id, so a page is the same slice whatever k
+        it was selected with and cursor pages never overlap.
+
+        Args:
+            catalog: Catalog the row ids address
+            filters: Filters the candidates matched
+            row_ids: Sorted candidate row ids
+            k: Number of rows to keep
+
+        Returns:
+            Up to k row ids ordered by descending score
+        """
+        if k <= 0 or not len(row_ids):
+            return row_ids[:0]
+        scores = self.score(catalog, filters, row_ids)
+
+        if k < len(scores):
+            # Partial sort: everything above the k-th best score, then its ties in row order
+            kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+            above = np.flatnonzero(scores > kth)
+            tied = np.flatnonzero(scores == kth)[:k - len(above)]
+            chosen = np.concatenate([above, tied])
+        else:
+            chosen = np.arange(len(scores))
+
+        order = np.lexsort((chosen, -scores[chosen]))
+        return row_ids[chosen[order]]
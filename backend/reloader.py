@@ -0,0 +1,93 @@
+"""Background catalog reload with atomic engine swap"""
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+from search_engine import SearchEngine
+from log import get_logger
+
+logger = get_logger('reloader')
+
+
+class CatalogReloader:
+    """
+    Hold the current SearchEngine and replace it when the catalog changes
+
+    A reload builds the new engine on a background thread, passing the
+    current one as `previous` so unchanged projects keep their postings,
+    then swaps the reference in one assignment. Requests that already
+    fetched `engine` finish on the old snapshot; later ones see the new data.
+    """
+
+    def __init__(self, factory: Callable[[Optional[SearchEngine]], SearchEngine],
+                 watch_paths: List[str], poll_interval: float = 0):
+        """
+        Args:
+            factory: Builds an engine, given the previous one (or None)
+            watch_paths: Files whose modification triggers a reload
+            poll_interval: Seconds between file checks; 0 disables watching
+        """
+        self.factory = factory
+        self.watch_paths = watch_paths
+        self.poll_interval = poll_interval
+        self.engine = factory(None)
+        self.generation = 0
+        self.last_error: Optional[str] = None
+        self._listeners: List[Callable[[SearchEngine], None]] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._mtimes = self._read_mtimes()
+
+        if poll_interval > 0:
+            threading.Thread(target=self._watch, name="catalog-watch", daemon=True).start()
+
+    def on_reload(self, listener: Callable[[SearchEngine], None]):
+        """Register a callback invoked with the new engine after each swap"""
+        self._listeners.append(listener)
+
+    def reload(self) -> bool:
+        """
+        Start a background reload
+
+        Returns:
+            False if a reload is already running
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self._rebuild, name="catalog-reload", daemon=True)
+            self._thread.start()
+            return True
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until the running reload, if any, has finished"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _rebuild(self):
+        try:
+            self._mtimes = self._read_mtimes()
+            engine = self.factory(self.engine)
+        except Exception as e:
+            # Keep serving the old snapshot
+            self.last_error = str(e)
+            logger.error("Catalog reload failed: %s", e)
+            return
+
+        self.engine = engine
+        self.generation += 1
+        self.last_error = None
+        for listener in self._listeners:
+            listener(engine)
+        logger.info("Catalog reloaded (generation %d)", self.generation)
+
+    def _read_mtimes(self):
+        return [os.path.getmtime(path) if os.path.exists(path) else None for path in self.watch_paths]
+
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_interval)
+            if self._read_mtimes() != self._mtimes:
+                self.reload()
@@ -0,0 +1,85 @@
+"""
+Compact result types for the chat hot path
+
+Results travel from SearchEngine through the pipeline, cache and executor
+to the endpoint as __slots__ dataclasses and are encoded straight to JSON
+bytes. PropertyCard and ChatResponse in models.py describe the same JSON
+for the API schema but are not built per request.
+"""
+import json
+from dataclasses import dataclass
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from models import ExtractedFilters
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install orjson for faster encoding
+    orjson = None
+
+
+@dataclass
+class PropertyResult:
+    """One property card; same fields, order and JSON as models.PropertyCard"""
+    __slots__ = ('project_id', 'title', 'city', 'locality', 'bhk', 'price', 'price_raw', 'project_name',
+                 'possession_status', 'amenities', 'carpet_area', 'bathrooms', 'balconies', 'slug', 'url')
+    project_id: str
+    title: str
+    city: str
+    locality: str
+    bhk: str
+    price: str
+    price_raw: float
+    project_name: str
+    possession_status: str
+    amenities: List[str]
+    carpet_area: Optional[float]
+    bathrooms: Optional[int]
+    balconies: Optional[int]
+    slug: str
+    url: str
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass
+class ChatResult:
+    """One chat answer; same fields, order and JSON as models.ChatResponse"""
+    __slots__ = ('summary', 'properties', 'filters_applied', 'total_results', 'next_cursor')
+    summary: str
+    properties: List[PropertyResult]
+    filters_applied: ExtractedFilters
+    total_results: int
+    next_cursor: Optional[str]
+
+    def to_dict(self) -> dict:
+        return {
+            'summary': self.summary,
+            'properties': [card.to_dict() for card in self.properties],
+            'filters_applied': self.filters_applied.model_dump(),
+            'total_results': self.total_results,
+            'next_cursor': self.next_cursor,
+        }
+
+
+def _default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    raise TypeError(f"Cannot encode {type(value).__name__} as JSON")
+
+
+def dumps(value) -> bytes:
+    """
+    Encode results (nested in plain dicts and lists) as UTF-8 JSON
+
+    Uses orjson when it is installed, which serializes the dataclasses
+    natively; falls back to the standard library encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(',', ':')).encode()
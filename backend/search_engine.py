@@ -1,31 +1,246 @@
 """Search Engine for Property Retrieval"""
+import operator
+import os
+import time
+from functools import partial, reduce
+import numpy as np
 import pandas as pd
-from typing import List, Dict
-from models import PropertyCard, ExtractedFilters
+from typing import List, Dict, NamedTuple, Optional, Tuple
+from models import ExtractedFilters, MatchStats
+from results import PropertyResult
+from index import Bitmap, InvertedIndex, SortedIndex
+from catalog import Catalog, TABLES, STATUS_VALUES, FURNISHING_VALUES, PARKING_VALUES
+from gazetteer import Gazetteer, LOCALITY, PROJECT
+from geo import load_places, search_radius
+from snapshot import source_hash, load_snapshot, save_snapshot
+from ranking import Ranker
+from aggregates import GroupStats, aggregate_rows
+from cache import filters_key
+from metrics import timed
+from log import get_logger
+
+logger = get_logger('search_engine')
+
+# PropertyResult field, in order -> catalog column holding its precomputed value
+CARD_COLUMNS = {
+    'project_id': 'project_id',
+    'title': 'title',
+    'city': 'city',
+    'locality': 'locality',
+    'bhk': 'bhk',
+    'price': 'price_display',
+    'price_raw': 'price_raw',
+    'project_name': 'title',
+    'possession_status': 'status_display',
+    'amenities': 'amenities',
+    'carpet_area': 'carpetArea',
+    'bathrooms': 'bathrooms',
+    'balconies': 'balcony',
+    'slug': 'slug',
+    'url': 'url',
+}
+
+# Index attribute -> (catalog column, kind); token indexes post a row under every word of its text,
+# range indexes sort rows by a numeric column (count columns use -1 for missing)
+INDEXES = {
+    'address_index': ('fullAddress', 'tokens'),
+    'project_name_index': ('projectName', 'tokens'),
+    'type_index': ('type', 'values'),
+    'status_index': ('status', 'values'),
+    'price_index': ('price', 'range'),
+    'project_index': ('project_id', 'values'),
+    'furnishing_index': ('furnishedType', 'values'),
+    'parking_index': ('parkingType', 'values'),
+    'carpet_area_index': ('carpetArea', 'range'),
+    'bathrooms_index': ('bathrooms', 'count'),
+    'maintenance_index': ('maintenanceCharges', 'range'),
+    'possession_index': ('possession_ts', 'range'),
+    'pincode_index': ('pincode', 'values'),
+}
+RANGE_KINDS = ('range', 'count')
+
+# Source columns behind the indexes and gazetteer; a project whose values change is
+# re-indexed on reload, whether or not the edit touched the variants' updatedAt
+SIGNATURE_COLUMNS = (
+    'projectName', 'slug', 'status', 'possessionDate', 'fullAddress', 'landmark', 'pincode', 'type',
+    'price', 'carpetArea', 'bathrooms', 'furnishedType', 'parkingType', 'maintenanceCharges',
+)
+
+# Filters matched by value through the indexes above; each may list alternatives
+VALUE_FILTERS = ('city', 'bhk', 'possession_status', 'locality', 'project_name', 'furnishing', 'parking')
+
+
+def _day_end(date: str) -> float:
+    """Last moment of an ISO date, in seconds since the epoch like the possession_ts column"""
+    return (pd.Timestamp(date) - pd.Timestamp(0)).total_seconds() + 86400 - 1e-3
+
+
+class Page(NamedTuple):
+    """One page of ranked matches"""
+    cards: List[PropertyResult]
+    total: int
+    stats: Optional[MatchStats] = None
+    # Every match, sorted by row id
+    row_ids: Optional[np.ndarray] = None
+
 
 class SearchEngine:
     """Search and retrieve properties from CSV data"""
     
-    def __init__(self, data_path: str = "data/"):
+    def __init__(self, data_path: str = "data/", normalized: bool = False,
+                 snapshot_path: Optional[str] = None, mmap: bool = False,
+                 previous: Optional["SearchEngine"] = None, weights: Optional[Dict[str, float]] = None,
+                 places_path: Optional[str] = None):
+        """
+        Args:
+            data_path: Directory holding the four catalog CSVs
+            normalized: Keep catalog tables normalized instead of joined
+            snapshot_path: Directory for binary snapshots, or None to always parse CSVs
+            mmap: Map snapshot arrays read-only so worker processes share one copy
+            previous: Engine over an older version of the data; only projects
+                whose variants have a newer updatedAt are re-indexed
+            weights: Ranking feature weights (see ranking.DEFAULT_WEIGHTS)
+            places_path: Locality/pincode centroid table for 'near' queries, or None for the bundled one
+        """
         self.data_path = data_path
-        self.df = self._load_and_merge_data()
+        self.ranker = Ranker(weights)
+        self.places = load_places(places_path)
+        self.snapshot_dir = None
+        mmap_mode = 'r' if mmap else None
+        start = time.perf_counter()
+        
+        if snapshot_path:
+            sources = [f"{data_path}{filename}" for filename, _ in TABLES.values()]
+            self.snapshot_dir = os.path.join(snapshot_path, source_hash(sources, normalized))
+            arrays = load_snapshot(self.snapshot_dir, mmap_mode=mmap_mode)
+            if arrays is not None:
+                self._load_arrays(arrays)
+                logger.info("Loaded snapshot %s in %.2fs", self.snapshot_dir, time.perf_counter() - start)
+                return
+        elif mmap:
+            raise ValueError("mmap requires a snapshot_path")
+        
+        self.catalog = Catalog(data_path, normalized=normalized)
+        reindexed = self._build_indexes(previous)
+        self.group_stats = GroupStats.build(self.catalog, self.address_index)
+        self._build_gazetteer()
+        logger.info("Built dataset from %s in %.2fs (%d/%d rows indexed)",
+                    data_path, time.perf_counter() - start, reindexed, len(self.catalog))
+        
+        if self.snapshot_dir:
+            save_snapshot(self.snapshot_dir, self._to_arrays())
+            logger.info("Wrote snapshot %s", self.snapshot_dir)
+            if mmap:
+                # Drop the private copy in favour of the shared mapping
+                self._load_arrays(load_snapshot(self.snapshot_dir, mmap_mode=mmap_mode))
+    
+    def _to_arrays(self) -> Dict[str, object]:
+        """Flatten catalog and indexes into named arrays for a snapshot"""
+        arrays = self.catalog.to_arrays()
+        for name in INDEXES:
+            arrays.update(getattr(self, name).to_arrays(name))
+        arrays.update(self.group_stats.to_arrays('group_stats'))
+        arrays['gazetteer'] = self.gazetteer
+        return arrays
+    
+    def _load_arrays(self, arrays: Dict[str, object]):
+        """Restore catalog and indexes from snapshot arrays"""
+        self.catalog = Catalog.from_arrays(arrays)
+        for name, (_, kind) in INDEXES.items():
+            index_type = SortedIndex if kind in RANGE_KINDS else InvertedIndex
+            setattr(self, name, index_type.from_arrays(arrays, name))
+        self.group_stats = GroupStats.from_arrays(arrays, 'group_stats', self.catalog)
+        self.gazetteer = arrays['gazetteer']
     
-    def _load_and_merge_data(self) -> pd.DataFrame:
-        """Load all CSV files and merge into single DataFrame"""
-        # Load all tables
-        projects = pd.read_csv(f"{self.data_path}project.csv")
-        addresses = pd.read_csv(f"{self.data_path}ProjectAddress.csv")
-        configs = pd.read_csv(f"{self.data_path}ProjectConfiguration.csv")
-        variants = pd.read_csv(f"{self.data_path}ProjectConfigurationVariant.csv")
+    def _build_gazetteer(self):
+        """Collect locality and project-name phrases once per distinct project/address"""
+        columns = ['project_id', 'projectName', 'slug', 'landmark', 'fullAddress']
+        projects = pd.DataFrame({
+            column: self.catalog.column(column).astype(object) for column in columns
+        }).drop_duplicates()
+        projects = projects.where(projects.notna(), None)
+        self.gazetteer = Gazetteer.from_projects(projects.itertuples(index=False, name=None))
+    
+    def _build_indexes(self, previous: Optional["SearchEngine"] = None) -> int:
+        """
+        Build inverted and range indexes over catalog row ids
         
-        # Merge tables
-        df = projects.merge(addresses, left_on='id', right_on='projectId', how='left', suffixes=('', '_addr'))
-        df = df.merge(configs, left_on='id', right_on='projectId', how='left', suffixes=('', '_config'))
-        df = df.merge(variants, left_on='id_config', right_on='configurationId', how='left', suffixes=('', '_variant'))
+        Args:
+            previous: Engine whose postings are carried over for unchanged projects
+            
+        Returns:
+            Number of rows that were (re-)indexed
+        """
+        remap, changed_rows = None, None
+        if previous is not None:
+            remap, changed_rows = self._diff_rows(previous)
         
-        return df
+        for name, (column, kind) in INDEXES.items():
+            if kind in RANGE_KINDS:
+                index_type, options = SortedIndex, {}
+            else:
+                index_type, options = InvertedIndex, {'tokenized': kind == 'tokens'}
+            
+            values = self.catalog.column(column, changed_rows)
+            if kind == 'count':
+                values = values.where(values >= 0)
+            if remap is None:
+                index = index_type.from_values(values, **options)
+            else:
+                fresh = index_type.from_values(values, **options)
+                index = index_type.merge(getattr(previous, name), remap, fresh, changed_rows)
+            setattr(self, name, index)
+        
+        return len(self.catalog) if changed_rows is None else len(changed_rows)
+    
+    def _project_spans(self) -> pd.DataFrame:
+        """
+        First row, row count, variant updatedAt stamps and a hash of the
+        SIGNATURE_COLUMNS per project (rows are grouped by project)
+        """
+        frame = pd.DataFrame({
+            'project': self.catalog.column('project_id').astype(object),
+            'updated': self.catalog.column('updatedAt').astype(object).fillna(''),
+            'row': np.arange(len(self.catalog)),
+        })
+        # Row hashes salted with the row's position in its project, summed (mod 2**64) per project
+        values = pd.DataFrame({column: self.catalog.column(column) for column in SIGNATURE_COLUMNS})
+        position = frame.groupby('project', sort=False).cumcount()
+        frame['signature'] = pd.util.hash_pandas_object(
+            pd.DataFrame({'values': pd.util.hash_pandas_object(values, index=False), 'position': position}),
+            index=False,
+        )
+        return frame.groupby('project', sort=False).agg(
+            start=('row', 'min'), count=('row', 'size'), updated=('updated', '|'.join), signature=('signature', 'sum')
+        )
     
-    def search(self, filters: ExtractedFilters) -> List[PropertyCard]:
+    def _diff_rows(self, previous: "SearchEngine"):
+        """
+        Match rows of unchanged projects between an older engine and this one
+        
+        Returns:
+            (remap, changed_rows): new row id for every old row (-1 if its
+            project changed or was removed) and the new row ids to re-index
+        """
+        spans = self._project_spans().join(previous._project_spans(), rsuffix='_old', how='inner')
+        spans = spans[
+            (spans['count'] == spans['count_old'])
+            & (spans['updated'] == spans['updated_old'])
+            & (spans['signature'] == spans['signature_old'])
+        ]
+        
+        counts = spans['count'].to_numpy()
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        old_rows = np.repeat(spans['start_old'].to_numpy(), counts) + offsets
+        new_rows = np.repeat(spans['start'].to_numpy(), counts) + offsets
+        
+        remap = np.full(len(previous.catalog), -1, dtype=np.int32)
+        remap[old_rows] = new_rows
+        changed = np.ones(len(self.catalog), dtype=bool)
+        changed[new_rows] = False
+        return remap, np.flatnonzero(changed).astype(np.int32)
+    
+    def search(self, filters: ExtractedFilters) -> List[PropertyResult]:
         """
         Search properties based on extracted filters
         
@@ -33,100 +248,274 @@ class SearchEngine:
             filters: ExtractedFilters object with search parameters
             
         Returns:
-            List of PropertyCard objects matching filters
-        """
-        df = self.df.copy()
-        
-        # Apply city filter
-        if filters.city:
-            # Simple filter - you can enhance with city ID mapping
-            df = df[df['fullAddress'].str.contains(filters.city, case=False, na=False)]
-        
-        # Apply BHK filter
-        if filters.bhk:
-            df = df[df['type'] == filters.bhk]
-        
-        # Apply budget filters
-        if filters.budget_max:
-            df = df[df['price'] <= filters.budget_max]
-        
-        if filters.budget_min:
-            df = df[df['price'] >= filters.budget_min]
-        
-        # Apply possession status filter
-        if filters.possession_status:
-            status_map = {
-                'Ready To Move': 'READY_TO_MOVE',
-                'Under Construction': 'UNDER_CONSTRUCTION'
-            }
-            mapped_status = status_map.get(filters.possession_status)
-            if mapped_status:
-                df = df[df['status'] == mapped_status]
-        
-        # Apply locality filter
-        if filters.locality:
-            df = df[df['fullAddress'].str.contains(filters.locality, case=False, na=False)]
-        
-        # Apply project name filter
-        if filters.project_name:
-            df = df[df['projectName'].str.contains(filters.project_name, case=False, na=False)]
-        
-        # Convert to PropertyCard objects
-        properties = []
-        for _, row in df.head(10).iterrows():  # Limit to 10 results
-            properties.append(self._row_to_property_card(row))
-        
-        return properties
-    
-    def _row_to_property_card(self, row) -> PropertyCard:
-        """Convert DataFrame row to PropertyCard"""
-        # Format price
-        price_raw = row.get('price', 0)
-        if pd.notna(price_raw):
-            if price_raw >= 10000000:
-                price_formatted = f"₹{price_raw/10000000:.2f} Cr"
+            List of PropertyResult objects matching filters
+        """
+        return self.search_page(filters, limit=10).cards  # Limit to 10 results
+    
+    def search_page(self, filters: ExtractedFilters, offset: int = 0, limit: int = 10,
+                    timings: Optional[Dict[str, float]] = None, with_stats: bool = False,
+                    narrow: Optional[Tuple[np.ndarray, ExtractedFilters]] = None) -> Page:
+        """
+        One page of matches plus the total match count
+        
+        The count comes from the index intersection. Matches are ranked by
+        relevance with a partial sort down to offset + limit, and only the
+        cards on the requested page are built.
+        
+        Args:
+            filters: ExtractedFilters object with search parameters
+            offset: Matches to skip
+            limit: Page size
+            timings: Filled with seconds spent per stage (search_filter, rank, card_build, aggregate)
+            with_stats: Also aggregate every match for the summary
+            narrow: (row ids, refinement): earlier matches that satisfy every
+                filter but the refinement, which is then applied to them alone
+                instead of to the whole catalog
+            
+        Returns:
+            Page of PropertyResults with the total number of matches
+        """
+        with timed(timings, 'search_filter'):
+            if narrow is None:
+                row_ids = self._match(filters)
             else:
-                price_formatted = f"₹{price_raw/100000:.2f} L"
-        else:
-            price_formatted = "Price on request"
-        
-        # Extract amenities
-        amenities = []
-        if row.get('lift'):
-            amenities.append('Lift')
-        if row.get('parkingType'):
-            amenities.append('Parking')
-        if row.get('balcony', 0) > 0:
-            amenities.append(f"{int(row['balcony'])} Balconies")
-        
-        # Status mapping
-        status_display = row.get('status', '').replace('_', ' ').title()
-        
-        return PropertyCard(
-            project_id=row.get('id', ''),
-            title=row.get('projectName', 'Unnamed Project'),
-            city=self._extract_city_from_address(row.get('fullAddress', '')),
-            locality=row.get('landmark', 'Location details available'),
-            bhk=row.get('type', 'N/A'),
-            price=price_formatted,
-            price_raw=price_raw if pd.notna(price_raw) else 0,
-            project_name=row.get('projectName', 'Unnamed Project'),
-            possession_status=status_display,
-            amenities=amenities[:3],  # Top 3 amenities
-            carpet_area=row.get('carpetArea'),
-            bathrooms=row.get('bathrooms'),
-            balconies=row.get('balcony'),
-            slug=row.get('slug', ''),
-            url=f"/project/{row.get('slug', '')}"
-        )
+                within, refinement = narrow
+                row_ids = self._match(refinement, within=within)
+        with timed(timings, 'rank'):
+            ranked = self.ranker.top_k(self.catalog, filters, row_ids, offset + limit)
+        with timed(timings, 'card_build'):
+            cards = self._to_property_cards(ranked[offset:])
+        stats = None
+        if with_stats:
+            with timed(timings, 'aggregate'):
+                stats = self.aggregate(filters, row_ids)
+        return Page(cards, len(row_ids), stats, row_ids)
     
-    def _extract_city_from_address(self, address: str) -> str:
-        """Extract city name from full address"""
-        if 'mumbai' in address.lower():
-            return 'Mumbai'
-        elif 'pune' in address.lower():
-            return 'Pune'
-        elif 'bangalore' in address.lower():
-            return 'Bangalore'
+    def search_batch(self, filters_list: List[ExtractedFilters], limit: int = 10,
+                     with_stats: bool = False) -> List[Page]:
+        """
+        First page and total count for many queries at once
+        
+        Identical filters are evaluated once, postings for filter terms the
+        queries share (the same city, BHK or budget) are looked up once, and
+        the cards of every page are gathered from the catalog in one pass.
+        
+        Args:
+            filters_list: Filters of each query
+            limit: Page size
+            with_stats: Also aggregate every match for the summaries
+            
+        Returns:
+            One Page per query, in input order
+        """
+        memo = {}
+        pages = {}
+        for filters in filters_list:
+            key = filters_key(filters)
+            if key not in pages:
+                row_ids = self._match(filters, memo)
+                stats = self.aggregate(filters, row_ids) if with_stats else None
+                pages[key] = (self.ranker.top_k(self.catalog, filters, row_ids, limit), len(row_ids), stats)
+        
+        ranked = [row_ids for row_ids, _, _ in pages.values()]
+        cards = self._to_property_cards(np.concatenate(ranked)) if ranked else []
+        
+        results = {}
+        start = 0
+        for key, (row_ids, total, stats) in pages.items():
+            results[key] = Page(cards[start:start + len(row_ids)], total, stats)
+            start += len(row_ids)
+        return [results[filters_key(filters)] for filters in filters_list]
+    
+    def aggregate(self, filters: ExtractedFilters, row_ids: np.ndarray) -> MatchStats:
+        """
+        Summary aggregates over every match
+        
+        Filters on city, BHK and status alone are answered from the
+        precomputed group table; anything else takes one pass over the rows.
+        """
+        groups = self.group_stats.select(filters)
+        if groups is not None:
+            stats = self.group_stats.stats(groups)
+            if stats.total == len(row_ids):
+                return stats
+        return aggregate_rows(self.catalog, row_ids)
+    
+    def get_stats(self) -> Dict:
+        """Catalog size and value distributions"""
+        prices = self.price_index.values
+        return {
+            "total_properties": len(self.catalog),
+            "total_projects": int(self.catalog.column('project_id').nunique()),
+            "bhk_types": {key: len(self.type_index.get(key)) for key in self.type_index.keys},
+            "status": {key: len(self.status_index.get(key)) for key in self.status_index.keys},
+            "price_min": float(prices[0]) if len(prices) else None,
+            "price_max": float(prices[-1]) if len(prices) else None,
+            "storage": "normalized" if self.catalog.normalized else "merged",
+            "snapshot": self.snapshot_dir,
+        }
+    
+    def _match(self, filters: ExtractedFilters, memo: Optional[Dict] = None,
+               within: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Resolve filters to sorted row ids with bitmap operations over index postings
+        
+        A field's alternatives are ORed, fields are ANDed and excluded values
+        subtracted; row ids are decoded once, at the end.
+        
+        Args:
+            filters: ExtractedFilters object with search parameters
+            memo: Bitmaps already resolved for other queries of a batch, keyed by filter term
+            within: Sorted row ids to search among instead of the whole catalog
+        """
+        memo = {} if memo is None else memo
+        
+        def term(key: tuple, lookup) -> Optional[Bitmap]:
+            if key not in memo:
+                memo[key] = lookup()
+            return memo[key]
+        
+        # Apply value filters; a value that maps to nothing leaves its field unfiltered
+        clauses = []
+        for field in VALUE_FILTERS:
+            bitmaps = [
+                term((field, value), partial(self._value_bitmap, field, value))
+                for value in filters.accepted(field)
+            ]
+            if bitmaps and all(bitmap is not None for bitmap in bitmaps):
+                clauses.append(reduce(operator.or_, bitmaps))
+        
+        # Apply the radius search around a place
+        if filters.near:
+            radius_km = search_radius(filters.radius_km)
+            clauses.append(term(('near', filters.near, radius_km), partial(self._near_bitmap, filters.near, radius_km)))
+        
+        if within is not None:
+            clauses.append(Bitmap.from_rows(within))
+        
+        # Smallest first, so each AND touches as few chunks as possible
+        bitmap = reduce(operator.and_, sorted(clauses, key=len)) if clauses else None
+        
+        # Apply range filters (budget, carpet area, bathrooms, maintenance, possession date)
+        ranges = []
+        if filters.budget_min or filters.budget_max:
+            ranges.append(('price_index', filters.budget_min or None, filters.budget_max or None))
+        if filters.carpet_area_min or filters.carpet_area_max:
+            ranges.append(('carpet_area_index', filters.carpet_area_min or None, filters.carpet_area_max or None))
+        if filters.bathrooms_min is not None or filters.bathrooms_max is not None:
+            ranges.append(('bathrooms_index', filters.bathrooms_min, filters.bathrooms_max))
+        if filters.maintenance_max:
+            ranges.append(('maintenance_index', None, filters.maintenance_max))
+        if filters.possession_by:
+            ranges.append(('possession_index', None, _day_end(filters.possession_by)))
+        
+        # Narrowest first; once the rows left are fewer than a range holds, check
+        # their column values instead of materializing and intersecting the range
+        checked = []
+        for name, low, high in sorted(ranges, key=lambda entry: getattr(self, entry[0]).count(entry[1], entry[2])):
+            index = getattr(self, name)
+            if not checked and (bitmap is None or index.count(low, high) <= len(bitmap)):
+                rows = term((name, low, high), partial(index.bitmap, low, high))
+                bitmap = rows if bitmap is None else bitmap & rows
+            else:
+                checked.append((name, low, high))
+        
+        # Apply exclusions
+        for field, values in (filters.exclude or {}).items():
+            for value in values:
+                excluded = term((field, value), partial(self._value_bitmap, field, value))
+                if excluded is not None:
+                    if bitmap is None:
+                        bitmap = term(('all',), partial(Bitmap.full, len(self.catalog)))
+                    bitmap = bitmap - excluded
+        
+        if bitmap is None:
+            row_ids = np.arange(len(self.catalog), dtype=np.int32)
         else:
-            return 'India'
+            row_ids = bitmap.to_rows()
+        for name, low, high in checked:
+            row_ids = self._filter_range(name, row_ids, low, high)
+        return row_ids
+    
+    def _value_bitmap(self, field: str, value: str) -> Optional[Bitmap]:
+        """Rows where a value filter holds, or None when the value does not constrain the field"""
+        if field == 'city':
+            return self.address_index.match_bitmap(value)
+        if field == 'bhk':
+            return self.type_index.bitmap(value)
+        if field == 'possession_status':
+            mapped_status = STATUS_VALUES.get(value)
+            return self.status_index.bitmap(mapped_status) if mapped_status else None
+        if field == 'locality':
+            return Bitmap.from_rows(self._entity_rows(LOCALITY, value, self.address_index))
+        if field == 'project_name':
+            return Bitmap.from_rows(self._entity_rows(PROJECT, value, self.project_name_index))
+        if field == 'furnishing':
+            mapped_furnishing = FURNISHING_VALUES.get(value)
+            return self.furnishing_index.bitmap(mapped_furnishing) if mapped_furnishing else None
+        if field == 'parking':
+            # 'Any' asks only that some parking is listed
+            if value == 'Any':
+                return self.parking_index.any_bitmap()
+            mapped_parking = PARKING_VALUES.get(value)
+            return self.parking_index.bitmap(mapped_parking) if mapped_parking else None
+        raise ValueError(f"Unknown value filter: {field}")
+    
+    def _near_bitmap(self, place: str, radius_km: float) -> Bitmap:
+        """
+        Rows whose address pincode lies within radius_km of a place
+        
+        The place is a locality or pincode from the places table, or else a
+        catalog locality placed by the pincodes of its projects. A place that
+        cannot be located falls back to a token match on the address.
+        """
+        pincodes = self.places.around(self._anchor(place), radius_km)
+        if pincodes is None:
+            return self.address_index.match_bitmap(place)
+        return reduce(operator.or_, (self.pincode_index.bitmap(pincode) for pincode in pincodes))
+    
+    def _anchor(self, place: str) -> str:
+        """The place itself when the places table knows it, else the first known pincode of a catalog locality"""
+        if self.places.locate(place) is not None:
+            return place
+        for project_id in sorted(self.gazetteer.project_ids(LOCALITY, place) or ()):
+            pincodes = self.catalog.column('pincode', self.project_index.get(project_id)).dropna()
+            if len(pincodes) and self.places.locate(pincodes.iloc[0]) is not None:
+                return pincodes.iloc[0]
+        return place
+    
+    def _filter_range(self, name: str, row_ids: np.ndarray, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        """The row_ids whose indexed value lies in [low, high], read from the catalog column"""
+        column, kind = INDEXES[name]
+        values = self.catalog.column(column, row_ids).to_numpy(dtype=np.float64)
+        if kind == 'count':
+            values = np.where(values >= 0, values, np.nan)
+        keep = ~np.isnan(values)
+        if low is not None:
+            keep &= values >= low
+        if high is not None:
+            keep &= values <= high
+        return row_ids[keep]
+    
+    def _entity_rows(self, kind: str, name: str, fallback: InvertedIndex) -> np.ndarray:
+        """Rows of the projects a gazetteer entity refers to, else a token match on `fallback`"""
+        project_ids = self.gazetteer.project_ids(kind, name)
+        if project_ids is None:
+            return fallback.match(name)
+        return np.unique(np.concatenate([self.project_index.get(project_id) for project_id in project_ids]))
+    
+    def _to_property_cards(self, row_ids: np.ndarray) -> List[PropertyResult]:
+        """Emit PropertyResults for a page of row ids from the precomputed catalog columns"""
+        columns = {
+            field: self.catalog.column(column, row_ids).tolist()
+            for field, column in CARD_COLUMNS.items()
+        }
+        columns['amenities'] = [amenities.split('|') if amenities else [] for amenities in columns['amenities']]
+        # float32 areas go through their shortest repr so 188.73 is not emitted as 188.72999572753906
+        areas = self.catalog.column('carpetArea', row_ids).to_numpy().astype(str)
+        columns['carpet_area'] = [float(area) if area != 'nan' else None for area in areas]
+        for field in ('bathrooms', 'balconies'):
+            columns[field] = [count if count >= 0 else None for count in columns[field]]
+        
+        # Values are already normalized at load time, so no validation layer
+        return [PropertyResult(*values) for values in zip(*columns.values())]
@@ -0,0 +1,158 @@
+"""Conversation sessions: the filters and matches of each session's last message"""
+import importlib
+import re
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+
+from cache import ResultCache
+from geo import search_radius
+from models import ExtractedFilters, READING_FIELDS
+from search_engine import VALUE_FILTERS
+
+# A message that drops the session's filters instead of refining them
+START_OVER = re.compile(r'\b(?:start over|start again|new search|reset|clear (?:all |the )?filters)\b', re.IGNORECASE)
+
+# Filters a follow-up narrows by raising a minimum or lowering a maximum
+LOWER_BOUNDS = ('budget_min', 'carpet_area_min', 'bathrooms_min')
+UPPER_BOUNDS = ('budget_max', 'carpet_area_max', 'bathrooms_max', 'maintenance_max', 'possession_by', 'radius_km')
+
+
+class Session(NamedTuple):
+    """What a session's next message refines"""
+    filters: ExtractedFilters
+    # Sorted matches of filters, or None when there were too many to keep
+    row_ids: Optional[np.ndarray]
+    # Catalog generation the row ids address; a reload renumbers rows
+    generation: int
+
+
+class MemorySessionStore:
+    """
+    In-process sessions, least recently used evicted past max_sessions
+
+    A session expires ttl seconds after its last message. Each process
+    keeps its own sessions, so process executors need a shared backend.
+    """
+
+    def __init__(self, max_sessions: int = 10000, ttl: float = 1800):
+        self._sessions = ResultCache(max_entries=max_sessions, ttl=ttl)
+
+    def get(self, session_id: str) -> Optional[Session]:
+        return self._sessions.get(session_id)
+
+    def put(self, session_id: str, session: Session):
+        self._sessions.put(session_id, session)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._sessions.stats()
+        return {
+            "backend": "memory",
+            "sessions": stats["entries"],
+            "max_sessions": stats["max_entries"],
+            "ttl_seconds": stats["ttl_seconds"],
+            "evictions": stats["evictions"],
+        }
+
+
+def build_session_store(backend: str, max_sessions: int, ttl: float):
+    """
+    Session store named by configuration
+
+    Args:
+        backend: 'memory', 'none' (sessions ignored) or 'module:Class' for any
+            class with get(session_id), put(session_id, session) and stats(),
+            constructed with max_sessions and ttl keyword arguments
+        max_sessions: Sessions kept at most
+        ttl: Seconds a session lives after its last message
+
+    Raises:
+        ValueError: On a backend that is neither built in nor 'module:Class'
+    """
+    if backend == "none" or max_sessions <= 0:
+        return None
+    if backend == "memory":
+        return MemorySessionStore(max_sessions, ttl)
+    module, _, name = backend.partition(":")
+    if not module or not name:
+        raise ValueError(f"Unknown session store: {backend}")
+    return getattr(importlib.import_module(module), name)(max_sessions=max_sessions, ttl=ttl)
+
+
+def starts_over(message: str) -> bool:
+    """Whether the message asks for a fresh search rather than a refinement"""
+    return START_OVER.search(message) is not None
+
+
+def merge_filters(previous: ExtractedFilters, current: ExtractedFilters) -> ExtractedFilters:
+    """
+    A follow-up's filters on top of the session's
+
+    Filters the follow-up sets replace the session's, the rest are kept,
+    and exclusions accumulate. A value the follow-up asks for again is no
+    longer excluded, and one it excludes is dropped from the alternatives.
+    How the follow-up was read (its corrections) is its own.
+    """
+    merged = previous.model_dump(exclude=READING_FIELDS)
+    merged.update(current.model_dump(exclude_none=True))
+
+    exclude = {field: list(values) for field, values in (previous.exclude or {}).items()}
+    for field, values in (current.exclude or {}).items():
+        exclude[field] = list(dict.fromkeys(exclude.get(field, []) + values))
+    for field in list(exclude):
+        if getattr(current, field) is not None:
+            asked = set(current.accepted(field))
+            exclude[field] = [value for value in exclude[field] if value not in asked]
+        elif field in merged and merged[field] is not None:
+            kept = [value for value in previous.accepted(field) if value not in exclude[field]]
+            merged[field] = (kept[0] if len(kept) == 1 else kept) or None
+        if not exclude[field]:
+            del exclude[field]
+    merged['exclude'] = exclude or None
+    return ExtractedFilters(**merged)
+
+
+def narrowing(previous: ExtractedFilters, merged: ExtractedFilters) -> Optional[ExtractedFilters]:
+    """
+    Filters that turn the previous matches into the merged filters' matches
+
+    Returns:
+        The new and tightened filters alone, or None when the merged
+        filters are not a narrowing of the previous ones (a value or place
+        changed, a range widened, a filter or exclusion was dropped)
+    """
+    refinement = {}
+    for field in VALUE_FILTERS + ('near',):
+        before, after = set(previous.accepted(field)), set(merged.accepted(field))
+        if before and not (after and after <= before):
+            return None
+        if after != before:
+            refinement[field] = getattr(merged, field)
+
+    for field in LOWER_BOUNDS + UPPER_BOUNDS:
+        before, after = _bound(previous, field), _bound(merged, field)
+        if before is not None and (after is None or (after < before if field in LOWER_BOUNDS else after > before)):
+            return None
+        if after != before:
+            refinement[field] = after
+    if 'radius_km' in refinement:
+        refinement['near'] = merged.near
+
+    exclude = {}
+    for field, values in (merged.exclude or {}).items():
+        added = [value for value in values if value not in (previous.exclude or {}).get(field, [])]
+        if added:
+            exclude[field] = added
+    for field, values in (previous.exclude or {}).items():
+        if not set(values) <= set((merged.exclude or {}).get(field, [])):
+            return None
+    refinement['exclude'] = exclude or None
+    return ExtractedFilters(**refinement)
+
+
+def _bound(filters: ExtractedFilters, field: str):
+    """A range filter's value; a place searched around without a radius has the default one"""
+    value = getattr(filters, field)
+    if field == 'radius_km' and filters.near:
+        return search_radius(value)
+    return value
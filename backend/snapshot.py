@@ -0,0 +1,117 @@
+"""Binary snapshot of the prepared search dataset"""
+import hashlib
+import os
+import pickle
+import re
+import shutil
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+# Bump when the layout of catalog or index arrays changes
+SNAPSHOT_VERSION = 8
+
+OBJECTS_FILE = "objects.pkl"
+
+# Snapshot directories are named by source_hash
+SNAPSHOT_NAME = re.compile(r"[0-9a-f]{16}")
+
+
+def source_hash(paths: Iterable[str], *extra) -> str:
+    """
+    Hash source files plus any extra build options
+
+    Args:
+        paths: Files whose content defines the dataset
+        extra: Options that change the prepared layout (e.g. storage mode)
+
+    Returns:
+        Hex digest identifying one snapshot
+    """
+    digest = hashlib.sha256(f"v{SNAPSHOT_VERSION}".encode())
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    for value in extra:
+        digest.update(repr(value).encode())
+    return digest.hexdigest()[:16]
+
+
+def save_snapshot(directory: str, arrays: Dict[str, object]):
+    """
+    Write named arrays to a snapshot directory
+
+    Numeric arrays are stored as one .npy file each so they can later be
+    memory-mapped; everything else (categories, keys, options) is pickled
+    together. The directory is written under a temporary name and renamed
+    into place so readers never see a partial snapshot. Once it is in
+    place, the other snapshots next to it are removed: they hold datasets
+    it replaces (arrays already mapped from them stay readable on POSIX).
+    """
+    parent = os.path.dirname(os.path.normpath(directory)) or "."
+    os.makedirs(parent, exist_ok=True)
+    staging = f"{os.path.normpath(directory)}.tmp-{os.getpid()}"
+    os.makedirs(staging, exist_ok=True)
+
+    objects = {}
+    for name, value in arrays.items():
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            np.save(os.path.join(staging, f"{name}.npy"), value)
+        else:
+            objects[name] = value
+    with open(os.path.join(staging, OBJECTS_FILE), "wb") as f:
+        pickle.dump(objects, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    try:
+        os.rename(staging, directory)
+    except OSError:
+        # Another process published the same snapshot first
+        shutil.rmtree(staging, ignore_errors=True)
+    _remove_replaced(parent, os.path.basename(os.path.normpath(directory)))
+
+
+def _remove_replaced(parent: str, keep: str):
+    """Delete every complete snapshot in parent but keep; staging directories are left to their writers"""
+    for name in os.listdir(parent):
+        path = os.path.join(parent, name)
+        if name != keep and SNAPSHOT_NAME.fullmatch(name) and os.path.isfile(os.path.join(path, OBJECTS_FILE)):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def load_snapshot(directory: str, mmap_mode: Optional[str] = None) -> Optional[Dict[str, object]]:
+    """
+    Read a snapshot written by save_snapshot
+
+    Args:
+        directory: Snapshot directory
+        mmap_mode: Passed to np.load, e.g. 'r' to map arrays read-only
+
+    Returns:
+        Named arrays, or None if no complete snapshot exists
+    """
+    objects_path = os.path.join(directory, OBJECTS_FILE)
+    if not os.path.exists(objects_path):
+        return None
+
+    with open(objects_path, "rb") as f:
+        arrays = pickle.load(f)
+    for filename in os.listdir(directory):
+        if filename.endswith(".npy"):
+            arrays[filename[:-4]] = np.load(os.path.join(directory, filename), mmap_mode=mmap_mode)
+    return arrays
+
+
+if __name__ == "__main__":
+    import time
+    from config import Config
+    from search_engine import SearchEngine
+
+    start = time.perf_counter()
+    engine = SearchEngine(
+        data_path=Config.DATA_PATH,
+        normalized=Config.NORMALIZED_STORAGE,
+        snapshot_path=Config.SNAPSHOT_PATH,
+    )
+    print(f"Snapshot ready in {engine.snapshot_dir} ({time.perf_counter() - start:.2f}s)")
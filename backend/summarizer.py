@@ -1,36 +1,30 @@
 """Summary Generation Logic"""
-from typing import List
-from models import PropertyCard, ExtractedFilters
-import statistics
+from models import ExtractedFilters, MatchStats
+from geo import search_radius
 
 class Summarizer:
     """Generate intelligent summaries from search results"""
     
-    def generate_summary(self, properties: List[PropertyCard], filters: ExtractedFilters) -> str:
+    def generate_summary(self, stats: MatchStats, filters: ExtractedFilters) -> str:
         """
         Generate summary based on search results
         
         Args:
-            properties: List of PropertyCard objects
+            stats: Aggregates over every match, not just the page shown
             filters: Applied filters
             
         Returns:
             Human-readable summary string
         """
-        if not properties:
+        if not stats.total:
             return self._generate_no_results_summary(filters)
         
-        # Extract statistics
-        total = len(properties)
-        cities = list(set([p.city for p in properties]))
-        localities = list(set([p.locality for p in properties]))[:3]
-        bhk_types = list(set([p.bhk for p in properties]))
-        prices = [p.price_raw for p in properties if p.price_raw > 0]
-        avg_price = statistics.mean(prices) if prices else 0
-        
-        # Count statuses
-        ready_count = sum(1 for p in properties if 'ready' in p.possession_status.lower())
-        under_const_count = sum(1 for p in properties if 'construction' in p.possession_status.lower())
+        total = stats.total
+        cities = stats.cities
+        localities = stats.localities
+        avg_price = stats.avg_price
+        ready_count = stats.ready_count
+        under_const_count = stats.under_construction_count
         
         # Build summary
         summary_parts = []
@@ -44,9 +38,11 @@ class Summarizer:
         
         # BHK info
         if filters.bhk:
-            summary_parts.append(f"matching your {filters.bhk} requirement")
+            summary_parts.append(f"matching your {' or '.join(filters.accepted('bhk'))} requirement")
         
         # Location info
+        if filters.near:
+            summary_parts.append(f"within {search_radius(filters.radius_km):g} km of {filters.near}")
         if cities and len(cities) == 1:
             summary_parts.append(f"in {cities[0]}")
             if localities:
@@ -67,10 +63,7 @@ class Summarizer:
             summary_line2 += f"{under_const_count} are under construction. "
         
         # Third line - amenities
-        all_amenities = []
-        for p in properties:
-            all_amenities.extend(p.amenities)
-        common_amenities = list(set(all_amenities))[:3]
+        common_amenities = stats.amenities
         
         summary_line3 = ""
         if common_amenities:
@@ -84,10 +77,13 @@ class Summarizer:
         parts = ["No properties found"]
         
         if filters.bhk:
-            parts.append(f"for {filters.bhk}")
+            parts.append(f"for {' or '.join(filters.accepted('bhk'))}")
         
         if filters.city:
-            parts.append(f"in {filters.city}")
+            parts.append(f"in {' or '.join(filters.accepted('city'))}")
+        
+        if filters.near:
+            parts.append(f"within {search_radius(filters.radius_km):g} km of {filters.near}")
         
         if filters.budget_max:
             budget_str = f"₹{filters.budget_max/10000000:.1f} Cr" if filters.budget_max >= 10000000 else f"₹{filters.budget_max/100000:.0f} L"
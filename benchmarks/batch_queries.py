@@ -0,0 +1,77 @@
+"""
+Batch vs one-at-a-time chat throughput
+
+Replays a corpus of saved searches through the app, first as one
+/api/chat request per query and then as /api/chat/batch requests, with
+the response cache disabled so every query is searched.
+
+Usage:
+    python benchmarks/batch_queries.py --data-path backend/data/ --queries 2000 --batch-size 500
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+CITIES = ["Mumbai", "Pune", "Bangalore", "chembur", "baner"]
+BHKS = ["1BHK", "2BHK", "3BHK", "4BHK"]
+BUDGETS = ["", " under 80 lakhs", " under 1.5 cr", " under 3 cr"]
+STATUSES = ["", " ready to move", " under construction"]
+
+
+def saved_searches(count: int) -> list:
+    """Alert-style queries; like real saved searches, many repeat"""
+    combos = [
+        f"{bhk} in {city}{budget}{status}"
+        for city, bhk, budget, status in itertools.product(CITIES, BHKS, BUDGETS, STATUSES)
+    ]
+    return list(itertools.islice(itertools.cycle(combos), count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-path", default="backend/data/")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    os.environ.update({"DATA_PATH": args.data_path, "SNAPSHOT_PATH": "", "CACHE_MAX_ENTRIES": "0"})
+    from fastapi.testclient import TestClient
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+        # Load the dataset now so the first timed request does not pay for it
+        app.components()
+    client = TestClient(app.app)
+    queries = saved_searches(args.queries)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        single = [client.post("/api/chat", json={"message": query}).json() for query in queries]
+        single_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = []
+        for offset in range(0, len(queries), args.batch_size):
+            chunk = queries[offset:offset + args.batch_size]
+            batched.extend(client.post("/api/chat/batch", json={"messages": chunk}).json()["results"])
+        batch_s = time.perf_counter() - start
+
+    print(json.dumps({
+        "queries": len(queries),
+        "distinct_queries": len(set(queries)),
+        "batch_size": args.batch_size,
+        "single_ms_per_query": round(single_s / len(queries) * 1000, 3),
+        "batch_ms_per_query": round(batch_s / len(queries) * 1000, 3),
+        "speedup": round(single_s / batch_s, 2),
+        "identical_results": single == batched,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Bitmap set operations: correctness and cost
+
+Checks &, | and - of index.Bitmap against numpy set operations on random
+row sets mixing sparse (array) and dense (bitset) chunks. Every set also
+gets rows from the chunk edges (0, 65535, 65536, ...), whose low bits are
+0 or 0xFFFF. Then it times the operations against the numpy equivalents.
+
+Usage:
+    python benchmarks/bitmaps.py --rows 1000000 --cases 500
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from index import ARRAY_LIMIT, CHUNK_BITS, Bitmap  # noqa: E402
+
+OPERATIONS = {
+    "and": (lambda a, b: a & b, np.intersect1d),
+    "or": (lambda a, b: a | b, np.union1d),
+    "sub": (lambda a, b: a - b, np.setdiff1d),
+}
+
+
+def random_rows(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """Sorted unique rows, dense in some chunks and sparse or absent in others"""
+    chunk = 1 << CHUNK_BITS
+    parts = []
+    for high in range(-(-rows // chunk)):
+        start, stop = high * chunk, min((high + 1) * chunk, rows)
+        density = rng.choice([0, 1e-4, ARRAY_LIMIT / chunk / 2, ARRAY_LIMIT / chunk * 2, 0.9])
+        parts.append(np.flatnonzero(rng.random(stop - start) < density) + start)
+    edges = np.arange(0, rows, chunk)
+    edges = np.concatenate([edges, edges[1:] - 1, [rows - 1]])
+    parts.append(rng.choice(edges, size=rng.integers(0, len(edges) + 1), replace=False))
+    return np.unique(np.concatenate(parts)).astype(np.int32)
+
+
+def build(rng: np.random.Generator, rows: np.ndarray, size: int) -> Bitmap:
+    """A bitmap of rows, from sorted rows or a mask, as indexes build them"""
+    if rng.random() < 0.5:
+        return Bitmap.from_rows(rows)
+    mask = np.zeros(size, dtype=bool)
+    mask[rows] = True
+    return Bitmap.from_mask(mask)
+
+
+def check(size: int, cases: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    edge_cases = [np.array([0]), np.array([1 << CHUNK_BITS]), np.array([0, 1 << CHUNK_BITS]), np.arange(0)]
+    for case in range(cases):
+        if case < len(edge_cases) ** 2:
+            a, b = edge_cases[case // len(edge_cases)], edge_cases[case % len(edge_cases)]
+            a, b = np.asarray(a, dtype=np.int32), np.asarray(b, dtype=np.int32)
+        else:
+            a, b = random_rows(rng, size), random_rows(rng, size)
+        # Intersections and differences that leave exactly row 0 (or a chunk's first row) of a chunk
+        if case % 7 == 0 and len(a):
+            b = np.setdiff1d(b, a[:1]) if case % 2 else np.union1d(b, a[:1]).astype(np.int32)
+        for name, (operation, expected) in OPERATIONS.items():
+            result = operation(build(rng, a, size), build(rng, b, size))
+            want = expected(a, b)
+            assert np.array_equal(result.to_rows(), want), (name, case)
+            assert len(result) == len(want), (name, case)
+    return {"cases": cases, "rows": size, "status": "ok"}
+
+
+def timings(size: int, repeat: int, seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    a, b = random_rows(rng, size), random_rows(rng, size)
+    results = []
+    for name, (operation, expected) in OPERATIONS.items():
+        bitmap_ms, numpy_ms = [], []
+        for _ in range(repeat):
+            left, right = Bitmap.from_rows(a), Bitmap.from_rows(b)
+            left.chunks, right.chunks
+            start = time.perf_counter()
+            operation(left, right).to_rows()
+            bitmap_ms.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            expected(a, b)
+            numpy_ms.append(time.perf_counter() - start)
+        results.append({
+            "operation": name,
+            "bitmap_ms": round(min(bitmap_ms) * 1000, 3),
+            "numpy_ms": round(min(numpy_ms) * 1000, 3),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Row id range of the random sets")
+    parser.add_argument("--cases", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = {
+        "check": check(args.rows, args.cases, args.seed),
+        "timings": timings(args.rows, args.repeat, args.seed),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Synthetic catalog generator
+
+Writes project.csv, ProjectAddress.csv, ProjectConfiguration.csv and
+ProjectConfigurationVariant.csv with the same columns and value formats
+as backend/data/, at any size. Projects are generated in blocks and
+appended, so 10M variants never sit in memory at once.
+
+Usage:
+    python benchmarks/generate_catalog.py --variants 1000000 --output /tmp/catalog_1m/
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# city -> (cityId, locality -> (pincode, sub-localities))
+CITIES = {
+    'Mumbai': ('cmf6nu3ru000gvcxspxarll3v', {
+        'Chembur': ('400071', ['Ashoknagar', 'Sindhi Society', 'Tilak Nagar']),
+        'Andheri': ('400069', ['Marol', 'Chakala', 'Lokhandwala']),
+        'Powai': ('400076', ['Hiranandani Gardens', 'Chandivali']),
+        'Bandra': ('400050', ['Pali Hill', 'Khar Danda']),
+        'Navi Mumbai': ('400703', ['Vashi', 'Nerul', 'Kharghar']),
+    }),
+    'Pune': ('cmf50r5a00000vcj0k1iuocuu', {
+        'Shivajinagar': ('411005', ['Model Colony', 'Deccan Gymkhana']),
+        'Baner': ('411045', ['Balewadi', 'Pancard Club Road']),
+        'Wakad': ('411057', ['Hinjewadi', 'Kaspate Wasti']),
+        'Pimpri': ('411017', ['Sant Tukaram Nagar', 'Kalewadi']),
+        'Kharadi': ('411014', ['Eon IT Park', 'Chandan Nagar']),
+    }),
+    'Bangalore': ('cmf7blr0k0000vcq3e2hnb6ta', {
+        'Whitefield': ('560066', ['Brookefield', 'Kadugodi']),
+        'Koramangala': ('560034', ['5th Block', 'Ejipura']),
+        'Indiranagar': ('560038', ['HAL 2nd Stage', 'Domlur']),
+    }),
+}
+# Rough rate per square foot of carpet area
+RATE_PER_SQFT = {'Mumbai': 25000, 'Pune': 9000, 'Bangalore': 11000}
+
+NAME_PREFIXES = ['Sai', 'Shree', 'Gurukripa', 'Hari Om', 'Pristine', 'Queens', 'Leela', 'Sonai', 'Ashwini',
+                 'Godrej', 'Lodha', 'Kolte', 'Sunrise', 'Green', 'Royal', 'Silver', 'Blue', 'Palm']
+NAME_SUFFIXES = ['Heights', 'Residency', 'Enclave', 'Towers', 'Park', 'Gardens', 'Glory', 'Clara', 'Vista',
+                 'Square', 'Meadows', 'Court', 'Avenue', 'Homes']
+LANDMARKS = ['Near Railway Station', 'Opposite City Mall', 'Babys school', 'Hind high school',
+             'Beside Municipal Garden', 'Near Swami Vivekanand Jr College', 'Behind Bus Depot', 'Near Temple']
+
+TYPES = np.array(['1BHK', '2BHK', '3BHK', '4BHK', '5BHK', 'Office', 'Shop', 'Studio'])
+TYPE_WEIGHTS = np.array([0.24, 0.32, 0.22, 0.08, 0.02, 0.06, 0.04, 0.02])
+TYPE_ROOMS = np.array([1, 2, 3, 4, 5, 0, 0, 1])
+
+IMAGE_HOST = 'https://pub-d28896f69c604ec5aa743cb0397740d9.r2.dev'
+STATE_ID = 'cmf3ze56e0002vcf8e0hjqnsw'
+COUNTRY_ID = 'cmfw6qdtd0000vx6uelma0klf'
+EPOCH_2025 = np.datetime64('2025-01-01T00:00:00', 'ms')
+
+# Flattened (city, locality, sub-locality) choices
+PLACES = [
+    (city, locality, pincode, sub)
+    for city, (_, localities) in CITIES.items()
+    for locality, (pincode, subs) in localities.items()
+    for sub in subs
+]
+LOCALITY_IDS = {locality: f"cloc{i:021d}" for i, locality in enumerate(dict.fromkeys(place[1] for place in PLACES))}
+SUB_LOCALITY_IDS = {place[3]: f"csub{i:021d}" for i, place in enumerate(PLACES)}
+
+
+def _ids(prefix: str, start: int, count: int) -> np.ndarray:
+    """cuid-shaped 25 character ids, unique per table"""
+    return np.char.add(f"c{prefix}", np.char.zfill(np.arange(start, start + count).astype(str), 23))
+
+
+def _slugify(values: np.ndarray) -> np.ndarray:
+    return pd.Series(values).str.lower().str.replace(r'[^a-z0-9]+', '-', regex=True).str.strip('-').to_numpy()
+
+
+def _timestamps(rng: np.random.Generator, count: int, days: int = 270) -> np.ndarray:
+    offsets = rng.integers(0, days * 86_400_000, count).astype('timedelta64[ms]')
+    return pd.Series(EPOCH_2025 + offsets).dt.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-3].to_numpy()
+
+
+def _block(rng: np.random.Generator, project_start: int, projects: int, config_start: int, variant_start: int):
+    """One block of projects with their addresses, configurations and variants"""
+    place = rng.integers(0, len(PLACES), projects)
+    city = np.array([PLACES[i][0] for i in place])
+    locality = np.array([PLACES[i][1] for i in place])
+    pincode = np.array([PLACES[i][2] for i in place])
+    sub = np.array([PLACES[i][3] for i in place])
+
+    project_ids = _ids('p', project_start, projects)
+    names = np.char.add(np.char.add(rng.choice(NAME_PREFIXES, projects), ' '), rng.choice(NAME_SUFFIXES, projects))
+    names = np.where(rng.random(projects) < 0.3, np.char.add(names, np.char.mod(' %d', rng.integers(1, 9, projects))), names)
+    slug_numbers = np.char.zfill(rng.integers(0, 1_000_000, projects).astype(str), 6)
+    slugs = _slugify(np.array([' '.join(parts) for parts in zip(names, sub, locality, city, slug_numbers)]))
+    slugs = np.where(rng.random(projects) < 0.2, np.char.add('luxury-', slugs.astype(str)), slugs)
+    status = np.where(rng.random(projects) < 0.45, 'READY_TO_MOVE', 'UNDER_CONSTRUCTION')
+    possession = np.where(
+        (status == 'UNDER_CONSTRUCTION') & (rng.random(projects) < 0.6),
+        pd.Series(EPOCH_2025 + rng.integers(240, 1500, projects).astype('timedelta64[D]')).dt.strftime('%Y-%m-%d 00:00:00'),
+        None,
+    )
+
+    project = pd.DataFrame({
+        'id': project_ids,
+        'projectType': rng.choice(['RESIDENTIAL', 'COMMERCIAL', 'BOTH'], projects, p=[0.8, 0.1, 0.1]),
+        'projectName': names,
+        'projectCategory': rng.choice(['STANDALONE', 'COMPLEX', 'TOWNSHIP'], projects, p=[0.6, 0.3, 0.1]),
+        'slug': slugs,
+        'slugId': None,
+        'status': status,
+        'projectAge': np.where(rng.random(projects) < 0.2, rng.integers(0, 15, projects).astype(float), np.nan),
+        'reraId': np.char.add(np.char.add('["P5', np.char.zfill(rng.integers(0, 10**10, projects).astype(str), 10)), '"]'),
+        'countryId': COUNTRY_ID,
+        'stateId': STATE_ID,
+        'cityId': [CITIES[c][0] for c in city],
+        'localityId': [LOCALITY_IDS[l] for l in locality],
+        'subLocalityId': [SUB_LOCALITY_IDS[s] for s in sub],
+        'projectSummary': np.where(rng.random(projects) < 0.3, 'PROJECT SUMMARY', None),
+        'possessionDate': possession,
+    })
+
+    plots = np.char.mod('Plot no %d', rng.integers(1, 400, projects))
+    landmarks = rng.choice(LANDMARKS, projects)
+    address = pd.DataFrame({
+        'id': _ids('a', project_start, projects),
+        'projectId': project_ids,
+        'landmark': np.where(rng.random(projects) < 0.5, sub, landmarks),
+        'fullAddress': [
+            f"{plot}, {landmark}, {s}, {l}, {c}, Maharashtra {pin}" if c != 'Bangalore'
+            else f"{plot}, {landmark}, {s}, {l}, {c}, Karnataka {pin}"
+            for plot, landmark, s, l, c, pin in zip(plots, landmarks, sub, locality, city, pincode)
+        ],
+        'pincode': pincode,
+    })
+
+    # 1-3 configurations per project, 1-2 variants per configuration
+    config_counts = rng.integers(1, 4, projects)
+    configs = int(config_counts.sum())
+    config_project = np.repeat(np.arange(projects), config_counts)
+    config_ids = _ids('c', config_start, configs)
+    types = rng.choice(TYPES, configs, p=TYPE_WEIGHTS)
+    config = pd.DataFrame({
+        'id': config_ids,
+        'projectId': project_ids[config_project],
+        'propertyCategory': np.where(np.isin(types, ['Office', 'Shop']), 'COMMERCIAL', 'RESIDENTIAL'),
+        'type': types,
+        'customBHK': np.where(rng.random(configs) < 0.8, types, None),
+    })
+
+    variant_counts = rng.integers(1, 3, configs)
+    variants = int(variant_counts.sum())
+    variant_config = np.repeat(np.arange(configs), variant_counts)
+    rooms = TYPE_ROOMS[pd.Index(TYPES).get_indexer(types)][variant_config]
+    variant_city = city[config_project][variant_config]
+    carpet = np.round((np.maximum(rooms, 1) * 380 + rng.normal(0, 60, variants)).clip(150), 2)
+    rate = np.array([RATE_PER_SQFT[c] for c in variant_city]) * rng.uniform(0.7, 1.4, variants)
+    created = _timestamps(rng, variants)
+    balcony = np.where(rng.random(variants) < 0.05, np.nan, rng.integers(0, np.maximum(rooms, 1) + 1).astype(float))
+    images = rng.integers(0, 3, variants)
+    variant = pd.DataFrame({
+        'id': _ids('v', variant_start, variants),
+        'configurationId': config_ids[variant_config],
+        'bathrooms': np.maximum(rooms, 1) + rng.integers(0, 2, variants),
+        'privateBathrooms': np.where(rng.random(variants) < 0.05, rng.integers(0, 2, variants).astype(float), np.nan),
+        'publicBathrooms': np.where(rng.random(variants) < 0.05, rng.integers(0, 2, variants).astype(float), np.nan),
+        'balcony': balcony,
+        'furnishedType': rng.choice(['UNFURNISHED', 'SEMI_FURNISHED', 'FURNISHED'], variants, p=[0.6, 0.3, 0.1]),
+        'furnishingType': rng.choice(['[]', '["KITCHEN_APPLIANCES","BASIC_FURNITURE"]', '["KITCHEN_APPLIANCES","WARDROBE"]',
+                                      '["LIGHTS_FANS","BASIC_FURNITURE"]'], variants, p=[0.55, 0.15, 0.15, 0.15]),
+        'lift': np.where(rng.random(variants) < 0.5, 'true', 'false'),
+        'ageOfProperty': np.nan,
+        'parkingType': np.where(rng.random(variants) < 0.3, rng.choice(['COVERED', 'OPEN'], variants), None),
+        'listingType': 'Sell',
+        'floorPlanImage': np.char.add(f"{IMAGE_HOST}/", np.char.add(np.char.zfill(np.arange(variants).astype(str), 13), '-plan.jpg')),
+        'carpetArea': carpet,
+        'price': (np.round(carpet * rate / 100_000) * 100_000).astype(np.int64),
+        'propertyImages': np.where(images > 0, np.char.add(f'["{IMAGE_HOST}/', np.char.add(images.astype(str), '.jpg"]')), '[]'),
+        'maintenanceCharges': np.where(rng.random(variants) < 0.1, rng.integers(1000, 15000, variants).astype(str), None),
+        'aboutProperty': np.where(rng.random(variants) < 0.6, 'about property ', None),
+        'createdAt': created,
+        'updatedAt': np.where(rng.random(variants) < 0.3, _timestamps(rng, variants, days=300), created),
+    })
+    return project, address, config, variant
+
+
+def generate(output: str, variants: int, seed: int = 0, block_projects: int = 100_000) -> dict:
+    """
+    Write a catalog with `variants` variant rows to output/
+
+    Returns:
+        Row counts per table
+    """
+    os.makedirs(output, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    files = {
+        'projects': 'project.csv',
+        'addresses': 'ProjectAddress.csv',
+        'configs': 'ProjectConfiguration.csv',
+        'variants': 'ProjectConfigurationVariant.csv',
+    }
+    counts = dict.fromkeys(files, 0)
+
+    first = True
+    while counts['variants'] < variants:
+        # About 2.8 variants per project on average
+        projects = min(block_projects, max(1, int((variants - counts['variants']) / 2.8) + 1))
+        tables = _block(rng, counts['projects'], projects, counts['configs'], counts['variants'])
+        tables = dict(zip(files, tables))
+        tables['variants'] = tables['variants'].iloc[:variants - counts['variants']]
+        for name, table in tables.items():
+            table.to_csv(os.path.join(output, files[name]), mode='w' if first else 'a', header=first, index=False)
+            counts[name] += len(table)
+        first = False
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", type=int, default=100_000)
+    parser.add_argument("--output", required=True, help="Directory for the four CSVs")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = generate(args.output, args.variants, args.seed)
+    print(json.dumps({"output": args.output, "rows": counts, "seconds": round(time.perf_counter() - start, 2)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
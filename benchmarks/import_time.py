@@ -0,0 +1,82 @@
+"""
+Import time budget for backend/app.py
+
+Importing the app must stay cheap: no dataset load and no pandas or
+numpy until the lifespan hook (or the first request) builds the
+pipeline. Each measurement runs in a fresh interpreter. The app's own
+cost is its import time minus the time to import the web framework it
+sits on; the script exits non-zero when that goes over budget or a
+heavy module is imported eagerly, so it can gate CI.
+
+Usage:
+    python benchmarks/import_time.py --budget-ms 150
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+# Only the pipeline needs these; importing them is what made startup slow
+HEAVY_MODULES = ["pandas", "numpy", "multiprocessing", "search_engine", "pipeline"]
+
+BASELINE = "import fastapi, fastapi.middleware.cors, fastapi.responses, pydantic, dotenv"
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+
+def import_once(statement: str) -> dict:
+    """Run one import in a fresh interpreter from backend/"""
+    # A catalog path that does not exist: any eager load fails loudly instead of being timed
+    env = dict(os.environ, DATA_PATH=os.path.join(BACKEND, "missing-catalog") + os.sep, LOG_LEVEL="WARNING")
+    probe = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+        cwd=BACKEND, env=env, capture_output=True, text=True,
+    )
+    if probe.returncode != 0:
+        sys.exit(f"{statement!r} failed:\n{probe.stderr.strip().splitlines()[-1]}")
+    return json.loads(probe.stdout.strip().splitlines()[-1])
+
+
+def median_ms(statement: str, repeat: int) -> tuple:
+    runs = [import_once(statement) for _ in range(repeat)]
+    return statistics.median(run["seconds"] for run in runs) * 1000, runs[-1]["modules"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="Allowed import time of the app on top of the framework baseline")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement")
+    args = parser.parse_args()
+
+    baseline_ms, _ = median_ms(BASELINE, args.repeat)
+    app_ms, heavy = median_ms("import app", args.repeat)
+    overhead_ms = app_ms - baseline_ms
+
+    report = {
+        "framework_ms": round(baseline_ms, 1),
+        "app_ms": round(app_ms, 1),
+        "app_overhead_ms": round(overhead_ms, 1),
+        "budget_ms": args.budget_ms,
+        "eager_heavy_modules": heavy,
+    }
+    print(json.dumps(report, indent=2))
+
+    if heavy:
+        sys.exit(f"importing app loaded {', '.join(heavy)}")
+    if overhead_ms > args.budget_ms:
+        sys.exit(f"importing app took {overhead_ms:.0f} ms over the framework, budget is {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+QueryParser throughput
+
+Parses a fixed corpus of representative queries repeatedly and reports
+parses per second.
+
+Usage:
+    python benchmarks/parse_throughput.py --seconds 2
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+QUERIES = [
+    "3BHK flat in Pune under ₹1.2 Cr",
+    "2BHK ready to move in Mumbai",
+    "Properties under 80 lakhs",
+    "4BHK apartments near Baner",
+    "1BHK under construction in Pune",
+    "Ready to move properties in Bangalore",
+    "two bedroom flat in bengaluru max 90 lakhs",
+    "new launch in navi mumbai between 1 and 3 cr",
+    "show me something nice",
+]
+
+
+def main():
+    parser_args = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser_args.add_argument("--seconds", type=float, default=2.0)
+    args = parser_args.parse_args()
+
+    from query_parser import QueryParser
+
+    start = time.perf_counter()
+    parser = QueryParser()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    parses = 0
+    deadline = time.perf_counter() + args.seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for query in QUERIES:
+            parser.parse(query)
+        parses += len(QUERIES)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "parser_build_ms": round(build_ms, 2),
+        "parses": parses,
+        "parses_per_second": round(parses / elapsed),
+        "mean_us": round(elapsed / parses * 1e6, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Top-k ranking cost
+
+Compares the Ranker's partial-sort selection against a full sort of the
+same scores for growing candidate counts, then times ranked searches
+end to end on a real catalog.
+
+Usage:
+    python benchmarks/ranking.py --data-path backend/data/ --k 10 100
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+
+def best_of(fn, repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def selection(sizes, ks, repeat):
+    from ranking import Ranker
+
+    rng = np.random.default_rng(0)
+    results = []
+    for n in sizes:
+        # Coarse scores so ties at the k-th position are common, as with real features
+        scores = rng.integers(0, 1000, n) / 1000
+        row_ids = np.arange(n)
+        ranker = Ranker()
+        # Fixed scores isolate selection from feature gathering
+        ranker.score = lambda catalog, filters, candidates: scores
+        full = best_of(lambda: row_ids[np.lexsort((row_ids, -scores))], repeat)
+        for k in ks:
+            results.append({
+                "candidates": n,
+                "k": k,
+                "top_k_ms": round(best_of(lambda: ranker.top_k(None, None, row_ids, k), repeat), 3),
+                "full_sort_ms": round(full, 3),
+            })
+    return results
+
+
+def searches(data_path, ks, repeat):
+    from models import ExtractedFilters
+    from search_engine import SearchEngine
+
+    engine = SearchEngine(data_path=data_path)
+    results = []
+    for filters in (ExtractedFilters(), ExtractedFilters(city="Pune", budget_max=20000000),
+                    ExtractedFilters(bhk="2BHK", possession_status="Ready To Move")):
+        matches = len(engine._match(filters))
+        for k in ks:
+            results.append({
+                "filters": filters.model_dump(exclude_none=True),
+                "matches": matches,
+                "k": k,
+                "search_page_ms": round(best_of(lambda: engine.search_page(filters, 0, k), repeat), 3),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-path", default=None, help="Catalog directory for end-to-end timings")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    report = {"selection": selection(args.sizes, args.k, args.repeat)}
+    if args.data_path:
+        report["search"] = searches(args.data_path, args.k, args.repeat)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Result building and JSON encoding: Pydantic models vs compact results
+
+For pages of real catalog rows, times and measures the allocations of
+turning the page into response bytes two ways:
+
+    pydantic   PropertyCard per row, validated again inside ChatResponse,
+               encoded with model_dump_json (the previous hot path)
+    compact    PropertyResult __slots__ dataclasses inside a ChatResult,
+               encoded by results.dumps (orjson when installed)
+
+Allocations are tracemalloc's peak while building and encoding one page.
+
+Usage:
+    python benchmarks/response_encoding.py --data-path backend/data/ --limits 10 50 100
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+
+def pydantic_page(columns: dict, filters, total: int) -> bytes:
+    from models import ChatResponse, PropertyCard
+    fields = list(columns)
+    cards = [PropertyCard.model_construct(**dict(zip(fields, values))) for values in zip(*columns.values())]
+    response = ChatResponse(summary="", properties=cards, filters_applied=filters, total_results=total)
+    return response.model_dump_json().encode()
+
+
+def compact_page(columns: dict, filters, total: int) -> bytes:
+    from results import ChatResult, PropertyResult, dumps
+    cards = [PropertyResult(*values) for values in zip(*columns.values())]
+    return dumps(ChatResult(summary="", properties=cards, filters_applied=filters, total_results=total,
+                            next_cursor=None))
+
+
+def page_columns(engine, row_ids) -> dict:
+    """The per-field lists both paths start from, as SearchEngine builds them"""
+    from search_engine import CARD_COLUMNS
+    cards = engine._to_property_cards(row_ids)
+    return {field: [getattr(card, field) for card in cards] for field in CARD_COLUMNS}
+
+
+def measure(build, columns: dict, filters, total: int, seconds: float) -> dict:
+    build(columns, filters, total)
+    runs = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        build(columns, filters, total)
+        runs += 1
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    body = build(columns, filters, total)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "us_per_page": round(elapsed / runs * 1e6, 1),
+        "peak_alloc_kib": round(peak / 1024, 1),
+        "bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-path", default="backend/data/")
+    parser.add_argument("--limits", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--seconds", type=float, default=1.0, help="Timing window per measurement")
+    args = parser.parse_args()
+
+    os.environ["LOG_LEVEL"] = "WARNING"
+    import results
+    from models import ExtractedFilters
+    from search_engine import SearchEngine
+
+    engine = SearchEngine(data_path=args.data_path)
+    filters = ExtractedFilters()
+    row_ids = engine.ranker.top_k(engine.catalog, filters, engine._match(filters), max(args.limits))
+
+    report = {"rows": len(engine.catalog), "orjson": results.orjson is not None, "pages": []}
+    for limit in args.limits:
+        columns = page_columns(engine, row_ids[:limit])
+        old = measure(pydantic_page, columns, filters, len(row_ids), args.seconds)
+        new = measure(compact_page, columns, filters, len(row_ids), args.seconds)
+        assert json.loads(pydantic_page(columns, filters, 0)) == json.loads(compact_page(columns, filters, 0))
+        report["pages"].append({
+            "limit": limit,
+            "pydantic": old,
+            "compact": new,
+            "speedup": round(old["us_per_page"] / new["us_per_page"], 2),
+            "alloc_ratio": round(new["peak_alloc_kib"] / old["peak_alloc_kib"], 2),
+        })
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
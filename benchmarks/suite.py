@@ -0,0 +1,200 @@
+"""
+Benchmark suite over synthetic catalogs
+
+For each catalog size, generates a catalog with generate_catalog.py (or
+reuses one already on disk) and, in a fresh process per size, reports:
+
+    load       CSV build time, snapshot build/load time, RSS and catalog bytes
+    parse      QueryParser parses per second
+    search     p50/p99 SearchEngine.search_page latency per filter kind
+    chat       p50/p99 end-to-end /api/chat latency through an in-process client
+
+Results are printed (or written with --output) as JSON so runs can be
+diffed for regressions.
+
+Usage:
+    python benchmarks/suite.py --variants 10000 100000 1000000 --output results.json
+    python benchmarks/suite.py --data-path backend/data/
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS, "..", "backend"))
+sys.path.insert(0, BENCHMARKS)
+
+from generate_catalog import generate  # noqa: E402
+from parse_throughput import QUERIES  # noqa: E402
+
+# filter kind -> ExtractedFilters arguments
+SEARCH_FILTERS = {
+    "none": {},
+    "city": {"city": "Pune"},
+    "bhk": {"bhk": "2BHK"},
+    "budget": {"budget_min": 5000000, "budget_max": 20000000},
+    "status": {"possession_status": "Ready To Move"},
+    "locality": {"locality": "Chembur"},
+    "project_name": {"project_name": "Sai Heights"},
+    "carpet_area": {"carpet_area_min": 900, "carpet_area_max": 1500},
+    "bathrooms": {"bathrooms_min": 2},
+    "furnishing": {"furnishing": "Semi Furnished", "parking": "Covered"},
+    "possession_by": {"possession_by": "2026-12-31"},
+    "structured": {"city": "Pune", "carpet_area_min": 900, "bathrooms_min": 2, "furnishing": "Semi Furnished",
+                   "maintenance_max": 5000, "possession_by": "2027-12-31"},
+    "any_of": {"city": ["Pune", "Mumbai"], "bhk": ["2BHK", "3BHK"]},
+    "near": {"near": "Baner", "radius_km": 5, "bhk": "2BHK"},
+    "exclude": {"city": "Pune", "exclude": {"possession_status": ["Under Construction"], "bhk": ["1BHK"]}},
+    "combined": {"city": "Mumbai", "bhk": "2BHK", "budget_max": 30000000, "possession_status": "Ready To Move"},
+}
+
+
+def rss_mib() -> float:
+    """Current resident set size (Linux)"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def percentiles(samples: list) -> dict:
+    milliseconds = np.array(samples) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(milliseconds, 50)), 3),
+        "p99_ms": round(float(np.percentile(milliseconds, 99)), 3),
+        "mean_ms": round(float(milliseconds.mean()), 3),
+    }
+
+
+def timed_runs(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def measure(data_path: str, repeat: int, chat_requests: int, results):
+    """Run every benchmark against one catalog; called in a fresh process"""
+    os.environ.update({"DATA_PATH": data_path, "CACHE_MAX_ENTRIES": "0", "LOG_LEVEL": "WARNING"})
+    from models import ExtractedFilters
+    from query_parser import QueryParser
+    from search_engine import SearchEngine
+
+    report = {}
+    baseline = rss_mib()
+    start = time.perf_counter()
+    engine = SearchEngine(data_path=data_path)
+    report["load"] = {
+        "rows": len(engine.catalog),
+        "csv_build_s": round(time.perf_counter() - start, 3),
+        "rss_mib": round(rss_mib() - baseline, 1),
+        "catalog_mib": round(engine.catalog.memory_usage() / 2**20, 1),
+    }
+    with tempfile.TemporaryDirectory() as snapshot_path:
+        start = time.perf_counter()
+        SearchEngine(data_path=data_path, snapshot_path=snapshot_path)
+        report["load"]["snapshot_build_s"] = round(time.perf_counter() - start, 3)
+        for mmap in (False, True):
+            start = time.perf_counter()
+            SearchEngine(data_path=data_path, snapshot_path=snapshot_path, mmap=mmap)
+            report["load"]["snapshot_mmap_load_s" if mmap else "snapshot_load_s"] = round(time.perf_counter() - start, 3)
+
+    parser = QueryParser(gazetteer=engine.gazetteer, places=engine.places)
+    parses = len(QUERIES) * repeat
+    elapsed = sum(timed_runs(lambda: [parser.parse(query) for query in QUERIES], repeat))
+    report["parse"] = {"parses_per_second": round(parses / elapsed)}
+
+    report["search"] = {}
+    for kind, arguments in SEARCH_FILTERS.items():
+        filters = ExtractedFilters(**arguments)
+        total = engine.search_page(filters).total
+        report["search"][kind] = {"matches": total, **percentiles(timed_runs(lambda: engine.search_page(filters), repeat))}
+
+    os.environ["SNAPSHOT_PATH"] = ""
+    from fastapi.testclient import TestClient
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+        # Load the dataset now so the first timed request does not pay for it
+        app.components()
+    client = TestClient(app.app)
+    samples = []
+    for i in range(chat_requests):
+        query = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+        response = client.post("/api/chat", json={"message": query})
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    report["chat"] = {"requests": chat_requests, **percentiles(samples)}
+
+    results.put(report)
+
+
+def run_isolated(data_path: str, repeat: int, chat_requests: int) -> dict:
+    """Measure in a spawned process so load time and RSS start from a clean interpreter"""
+    context = mp.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=measure, args=(data_path, repeat, chat_requests, results))
+    process.start()
+    report = results.get()
+    process.join()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", type=int, nargs="+", default=[10_000, 100_000],
+                        help="Synthetic catalog sizes (variant rows)")
+    parser.add_argument("--data-path", help="Benchmark this catalog directory instead of generating")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "chatbot-bench"),
+                        help="Where generated catalogs are kept between runs")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per search and parse measurement")
+    parser.add_argument("--chat-requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    catalogs = []
+    if args.data_path:
+        catalogs.append((None, args.data_path))
+    else:
+        for variants in args.variants:
+            path = os.path.join(args.workdir, f"variants-{variants}-seed-{args.seed}") + os.sep
+            if not os.path.exists(os.path.join(path, "ProjectConfigurationVariant.csv")):
+                generate(path, variants, seed=args.seed)
+            catalogs.append((variants, path))
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "cpus": os.cpu_count(),
+            "machine": platform.machine(),
+        },
+        "runs": [],
+    }
+    for variants, path in catalogs:
+        run = {"variants": variants, "data_path": path}
+        run.update(run_isolated(os.path.abspath(path) + os.sep, args.repeat, args.chat_requests))
+        report["runs"].append(run)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
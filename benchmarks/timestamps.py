@@ -0,0 +1,70 @@
+"""
+Timestamp column parsing: correctness and cost
+
+Checks that catalog timestamp columns (updatedAt, possessionDate) load as
+seconds since the epoch whether stamps are naive, end in 'Z', carry an
+offset, or mix all three, and that unparseable values become NaN instead
+of failing the load. Then times parsing a column of the given size.
+
+Usage:
+    python benchmarks/timestamps.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from catalog import _timestamps  # noqa: E402
+
+# Column values -> expected seconds since the epoch (None for NaN)
+CASES = [
+    (["2024-05-01 10:00:00", "2024-05-01T10:00:00.000"], [1714557600.0, 1714557600.0]),
+    (["2030-01-01T00:00:00.000Z", "2024-05-01T10:00:00Z"], [1893456000.0, 1714557600.0]),
+    (["2024-05-01T15:30:00+05:30", "2024-05-01T10:00:00Z"], [1714557600.0, 1714557600.0]),
+    (["2030-01-01T00:00:00.000Z", "2024-05-01 10:00:00", "2024-05-01T15:30:00+05:30", "not a date", None],
+     [1893456000.0, 1714557600.0, 1714557600.0, None, None]),
+    ([None, None], [None, None]),
+]
+
+
+def check() -> dict:
+    for values, expected in CASES:
+        seconds = _timestamps(pd.Series(values, dtype=object))
+        want = np.array([np.nan if value is None else value for value in expected])
+        assert np.array_equal(seconds, want, equal_nan=True), (values, seconds.tolist())
+    return {"cases": len(CASES), "status": "ok"}
+
+
+def timings(rows: int, repeat: int) -> dict:
+    rng = np.random.default_rng(0)
+    stamps = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 86400 * 365, rows), unit="s")
+    naive = pd.Series(stamps.strftime("%Y-%m-%d %H:%M:%S"), dtype=object)
+    zulu = pd.Series(stamps.strftime("%Y-%m-%dT%H:%M:%S.000Z"), dtype=object)
+    results = {"rows": rows}
+    for name, values in (("naive_ms", naive), ("zulu_ms", zulu)):
+        best = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _timestamps(values)
+            best.append(time.perf_counter() - start)
+        results[name] = round(min(best) * 1000, 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps({"check": check(), "timings": timings(args.rows, args.repeat)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Per-worker memory with private vs memory-mapped datasets
+
+Starts N worker processes that each load a SearchEngine, runs a few
+searches so the dataset pages are touched, then reports RSS and PSS
+(proportional set size, which splits shared pages between processes)
+for every worker while all of them are alive.
+
+Usage:
+    python benchmarks/worker_rss.py --data-path backend/data/ --workers 1 4 8
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+
+def read_memory() -> dict:
+    """RSS and PSS of the current process in MiB (Linux only)"""
+    memory = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            field, _, value = line.partition(":")
+            if field in ("Rss", "Pss", "Pss_Anon", "Pss_File"):
+                memory[field.lower()] = int(value.split()[0]) / 1024
+    return memory
+
+
+def worker(data_path, snapshot_path, mmap, barrier, results):
+    from models import ExtractedFilters
+    from search_engine import SearchEngine
+
+    engine = SearchEngine(data_path=data_path, snapshot_path=snapshot_path, mmap=mmap)
+    for filters in (ExtractedFilters(), ExtractedFilters(city="Pune", bhk="2BHK"),
+                    ExtractedFilters(budget_max=20000000)):
+        engine.search(filters)
+
+    barrier.wait()
+    results.put(read_memory())
+    barrier.wait()
+
+
+def measure(data_path, snapshot_path, mmap, workers) -> dict:
+    context = mp.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(data_path, snapshot_path, mmap, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in range(workers)]
+    for process in processes:
+        process.join()
+
+    return {
+        "mode": "mmap" if mmap else "private",
+        "workers": workers,
+        "rss_mib_per_worker": round(sum(s["rss"] for s in samples) / workers, 1),
+        "pss_mib_per_worker": round(sum(s["pss"] for s in samples) / workers, 1),
+        "pss_mib_total": round(sum(s["pss"] for s in samples), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-path", default="backend/data/")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    data_path = os.path.join(args.data_path, "")
+    with tempfile.TemporaryDirectory() as snapshot_path:
+        # Build the snapshot once so workers only measure loading
+        from search_engine import SearchEngine
+        SearchEngine(data_path=data_path, snapshot_path=snapshot_path)
+
+        report = [
+            measure(data_path, snapshot_path, mmap, workers)
+            for mmap in (False, True)
+            for workers in args.workers
+        ]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()